@@ -3,9 +3,13 @@ Discord Username Monitor - Browser Session Acquisition
 Uses Selenium to capture authentic browser sessions for enhanced reliability
 """
 
+import asyncio
+import base64
 import json
+import re
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from selenium import webdriver
@@ -19,6 +23,48 @@ from webdriver_manager.chrome import ChromeDriverManager
 from utils.logger import get_logger
 from pystyle import Colors
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36"
+
+# Prefilter constants for the performance-log hot loop
+_REQ_WILL_BE_SENT = '"Network.requestWillBeSent"'
+_USERS_ME_RE = re.compile(r'api/v\d+/users/@me')
+
+# The fallback super-properties never vary per token, so the JSON + base64
+# encoding is done once at import instead of on every fallback call
+_SUPER_PROPS = {
+    "os": "Windows",
+    "browser": "Chrome",
+    "device": "",
+    "system_locale": "en-US",
+    "browser_user_agent": _USER_AGENT,
+    "browser_version": "136.0.0.0",
+    "os_version": "10",
+    "referrer": "",
+    "referring_domain": "",
+    "referrer_current": "https://discord.com/",
+    "referring_domain_current": "discord.com",
+    "release_channel": "stable",
+    "client_build_number": 423077
+}
+_SUPER_PROPS_B64 = base64.b64encode(
+    json.dumps(_SUPER_PROPS, separators=(',', ':')).encode()
+).decode()
+
+_STATIC_FALLBACK_HEADERS = {
+    "Content-Type": "application/json",
+    "User-Agent": _USER_AGENT,
+    "Accept": "*/*",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Origin": "https://discord.com",
+    "Referer": "https://discord.com/channels/@me",
+    "X-Super-Properties": _SUPER_PROPS_B64
+}
+
 
 class BrowserSessionAcquisition:
     """Handles browser session acquisition using Selenium"""
@@ -27,17 +73,191 @@ class BrowserSessionAcquisition:
         self.config = config
         self.logger = get_logger(__name__)
         self.session_file = Path("data/browser_sessions.json")
-        
+        self._profile_lock_fds = []
+        self._driver_path = None
+        self._driver_server = None
+        self._driver_server_url = None
+
+    def _start_driver_server(self):
+        """Launch one shared chromedriver server for all capture workers
+
+        Each worker opens a session on this server instead of forking its own
+        chromedriver process, so N workers cost one chromedriver startup.
+        """
+        import socket
+        import subprocess
+        import urllib.request
+
+        if self._driver_server:
+            return
+
+        with socket.socket() as s:
+            s.bind(('127.0.0.1', 0))
+            port = s.getsockname()[1]
+
+        try:
+            self._driver_server = subprocess.Popen(
+                [self._resolve_driver_path(), f"--port={port}", "--allowed-ips=127.0.0.1"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+        except OSError as e:
+            self.logger.warning(f"Failed to start shared chromedriver server: {e}")
+            self._driver_server = None
+            return
+
+        url = f"http://127.0.0.1:{port}"
+        deadline = time.time() + 15
+        while time.time() < deadline:
+            try:
+                with urllib.request.urlopen(f"{url}/status", timeout=2) as resp:
+                    if resp.status == 200:
+                        self._driver_server_url = url
+                        self.logger.info(f"Shared chromedriver server ready on port {port}")
+                        return
+            except OSError:
+                time.sleep(0.1)
+
+        self.logger.warning("Shared chromedriver server did not become ready, falling back")
+        self._stop_driver_server()
+
+    def _stop_driver_server(self):
+        """Terminate the shared chromedriver server if running"""
+        if self._driver_server:
+            try:
+                self._driver_server.terminate()
+                self._driver_server.wait(timeout=5)
+            except Exception:
+                try:
+                    self._driver_server.kill()
+                except Exception:
+                    pass
+            self._driver_server = None
+        self._driver_server_url = None
+
+    def _get_chrome_major_version(self):
+        """Detect the installed Chrome major version (best effort)"""
+        import subprocess
+
+        for binary in ('google-chrome', 'google-chrome-stable', 'chromium', 'chrome'):
+            try:
+                output = subprocess.run(
+                    [binary, '--version'], capture_output=True, text=True, timeout=10
+                ).stdout
+                for part in output.split():
+                    if part[0].isdigit():
+                        return part.split('.')[0]
+            except (OSError, subprocess.SubprocessError):
+                continue
+        return "unknown"
+
+    def _resolve_driver_path(self):
+        """Resolve the chromedriver binary, caching the path between runs
+
+        ChromeDriverManager().install() does a network round-trip on every
+        call to check the Chrome-for-Testing version manifest. Cache the
+        resolved path keyed by Chrome major version and skip the manager
+        entirely on hits.
+        """
+        if self._driver_path and os.path.exists(self._driver_path):
+            return self._driver_path
+
+        cache_file = Path("data/.chromedriver_cache.json")
+        major_version = self._get_chrome_major_version()
+
+        try:
+            with open(cache_file, 'r') as f:
+                cache = json.load(f)
+            cached_path = cache.get(major_version)
+            if cached_path and os.path.exists(cached_path) and os.access(cached_path, os.X_OK):
+                self.logger.info(f"Using cached chromedriver: {cached_path}")
+                self._driver_path = cached_path
+                return cached_path
+        except (OSError, json.JSONDecodeError):
+            cache = {}
+
+        # Cache miss - resolve via webdriver-manager and persist the result
+        driver_path = ChromeDriverManager().install()
+        cache[major_version] = driver_path
+        try:
+            cache_file.parent.mkdir(exist_ok=True)
+            with open(cache_file, 'w') as f:
+                json.dump(cache, f)
+        except OSError as e:
+            self.logger.warning(f"Failed to write chromedriver cache: {e}")
+
+        self._driver_path = driver_path
+        return driver_path
+
+    def _acquire_profile_dir(self, name="chrome-profile"):
+        """Get a persistent Chrome profile directory, locking it against concurrent use"""
+        profile_dir = Path("data") / name
+        profile_dir = profile_dir.resolve()
+        profile_dir.mkdir(parents=True, exist_ok=True)
+
+        try:
+            import fcntl
+
+            lock_file = profile_dir / ".lock"
+            fd = open(lock_file, 'w')
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                self._profile_lock_fds.append(fd)
+                return profile_dir
+            except OSError:
+                fd.close()
+                self.logger.warning("Profile directory locked by another process, using fallback")
+        except ImportError:
+            # Windows - no fcntl, assume single instance
+            return profile_dir
+
+        # Fall back to a per-process profile so concurrent runs don't clash
+        fallback_dir = profile_dir.parent / f"{name}-{os.getpid()}"
+        fallback_dir.mkdir(parents=True, exist_ok=True)
+        return fallback_dir
+
+    def _release_profile_locks(self):
+        """Release any profile directory locks held"""
+        for fd in self._profile_lock_fds:
+            try:
+                fd.close()
+            except Exception:
+                pass
+        self._profile_lock_fds = []
+
     async def acquire_sessions(self, accounts):
-        """Acquire browser sessions for accounts"""
+        """Acquire browser sessions for accounts
+
+        Honors browser.mode:
+          "always"        - full Selenium capture (default)
+          "fallback_only" - Selenium capture, generated headers for failures
+          "never"         - skip the browser entirely and generate headers;
+                            instant, but without Cloudflare-cleared cookies
+        """
         self.logger.info("Starting browser session acquisition")
-        
+
+        mode = self.config.get('browser', {}).get('mode', 'always')
+
+        if mode == 'never':
+            self.logger.info("browser.mode=never - generating fallback sessions without Selenium")
+            return {a.email: self._generate_fallback_session_data(a) for a in accounts}
+
         # Check if we should reuse existing sessions
         if self._should_reuse_sessions():
             return self._load_existing_sessions()
-        
+
         # Acquire new sessions
-        return await self._acquire_new_sessions(accounts)
+        session_data = await self._acquire_new_sessions(accounts)
+
+        if mode == 'fallback_only':
+            # Backfill accounts the browser couldn't capture instead of
+            # leaving them without any session data
+            for account in accounts:
+                if account.email not in session_data:
+                    self.logger.info(f"Using fallback session data for {account.email}")
+                    session_data[account.email] = self._generate_fallback_session_data(account)
+
+        return session_data
     
     def _should_reuse_sessions(self):
         """Check if we should reuse existing session data"""
@@ -47,10 +267,9 @@ class BrowserSessionAcquisition:
         try:
             file_age = time.time() - self.session_file.stat().st_mtime
             if file_age < 3600:  # Less than 1 hour
-                from pystyle import Write
-                reuse = Write.Input(
-                    f'Found recent session data ({file_age/60:.0f}min old). Reuse? (y/n): ',
-                    Colors.blue_to_cyan, interval=0.02
+                from utils.io import prompt
+                reuse = prompt(
+                    f'Found recent session data ({file_age/60:.0f}min old). Reuse? (y/n): '
                 ).lower()
                 return reuse == 'y'
         except Exception as e:
@@ -61,8 +280,8 @@ class BrowserSessionAcquisition:
     def _load_existing_sessions(self):
         """Load existing session data from file"""
         try:
-            with open(self.session_file, 'r') as f:
-                data = json.load(f)
+            raw = self.session_file.read_bytes()
+            data = orjson.loads(raw) if orjson else json.loads(raw)
             self.logger.info("Loaded existing browser session data")
             return data
         except Exception as e:
@@ -70,46 +289,93 @@ class BrowserSessionAcquisition:
             return {}
     
     async def _acquire_new_sessions(self, accounts):
-        """Acquire new browser sessions using Selenium"""
+        """Acquire new browser sessions using parallel Selenium workers"""
         print(f"\n{Colors.cyan}━━━ Browser Session Acquisition ━━━{Colors.white}")
         print("Chrome will launch to capture authentic session data")
-        
+
         session_data = {}
+
+        worker_count = self.config.get('browser', {}).get('capture_workers', 3)
+        worker_count = max(1, min(worker_count, len(accounts)))
+
+        account_queue = asyncio.Queue()
+        for account in accounts:
+            account_queue.put_nowait(account)
+
+        loop = asyncio.get_event_loop()
+
+        try:
+            # One chromedriver process serves every worker session
+            self._start_driver_server()
+
+            with ThreadPoolExecutor(max_workers=worker_count) as pool:
+                workers = [
+                    self._capture_worker(loop, pool, account_queue, session_data, worker_id)
+                    for worker_id in range(worker_count)
+                ]
+                await asyncio.gather(*workers)
+        finally:
+            self._stop_driver_server()
+            self._release_profile_locks()
+
+        # Save session data
+        if session_data:
+            self._save_session_data(session_data)
+            print(f"{Colors.green}✓ Session data saved{Colors.white}")
+
+        return session_data
+
+    async def _capture_worker(self, loop, pool, account_queue, session_data, worker_id):
+        """Worker coroutine driving one Chrome instance over queued accounts"""
         driver = None
-        
+
         try:
-            driver = self._create_driver()
-            
-            for account in accounts:
+            driver = await loop.run_in_executor(pool, self._create_driver, worker_id)
+
+            while True:
+                try:
+                    account = account_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+
                 print(f"\n{Colors.cyan}Processing account: {account.email}{Colors.white}")
-                
+
                 try:
-                    account_data = await self._capture_account_session(driver, account)
+                    account_data = await loop.run_in_executor(
+                        pool, self._capture_account_session, driver, account
+                    )
                     if account_data:
                         session_data[account.email] = account_data
                         print(f"{Colors.green}✓ Session captured for {account.email}{Colors.white}")
                     else:
                         print(f"{Colors.red}✗ Failed to capture session for {account.email}{Colors.white}")
-                        
+
+                except WebDriverException as e:
+                    # Fatal browser error - relaunch the driver and continue
+                    self.logger.error(f"WebDriver error for {account.email}, restarting driver: {e}")
+                    print(f"{Colors.red}✗ Browser error for {account.email}, restarting{Colors.white}")
+                    try:
+                        driver.quit()
+                    except Exception:
+                        pass
+                    driver = await loop.run_in_executor(pool, self._create_driver, worker_id)
+                    continue
+
                 except Exception as e:
                     self.logger.error(f"Error processing {account.email}: {e}")
                     print(f"{Colors.red}✗ Error processing {account.email}: {e}{Colors.white}")
-                    
-                # Delay between accounts
-                time.sleep(2)
-                
+
+                # Reset browser state for the next account instead of relaunching
+                await loop.run_in_executor(pool, self._reset_driver, driver)
+
         finally:
             if driver:
-                driver.quit()
-        
-        # Save session data
-        if session_data:
-            self._save_session_data(session_data)
-            print(f"{Colors.green}✓ Session data saved{Colors.white}")
-        
-        return session_data
-    
-    def _create_driver(self):
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+
+    def _create_driver(self, worker_id=0):
         """Create a Chrome WebDriver instance"""
         options = webdriver.ChromeOptions()
         
@@ -122,64 +388,149 @@ class BrowserSessionAcquisition:
         options.add_argument('--disable-features=VizDisplayCompositor')
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
-        
-        # Enable performance logging for network capture
-        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
-        
-        # Uncomment for headless mode
-        # options.add_argument('--headless')
+
+        # Persistent profile - reuses Discord's cached assets and Cloudflare
+        # clearance cookies across runs instead of redownloading everything.
+        # Each worker gets its own profile so Chrome instances don't clash.
+        profile_name = "chrome-profile" if worker_id == 0 else f"chrome-profile-{worker_id}"
+        profile_dir = self._acquire_profile_dir(profile_name)
+        options.add_argument(f'--user-data-dir={profile_dir}')
+        options.add_argument('--profile-directory=Default')
+
+        # We only read localStorage and network logs, so skip the rendering
+        # work: no images, no GPU/compositor, no background services
+        options.add_argument('--disable-gpu')
+        options.add_argument('--disable-extensions')
+        options.add_argument('--mute-audio')
+        options.add_argument('--disable-background-networking')
+        options.add_argument('--disable-sync')
+        options.add_argument('--metrics-recording-only')
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+            "profile.managed_default_content_settings.media_stream": 2
+        })
+
+        # Headless mode is config-gated: Cloudflare challenges occasionally
+        # require a full browser, so it defaults to off
+        if self.config.get('browser', {}).get('headless', False):
+            options.add_argument('--headless=new')
+
+        # Enable performance logging for network capture, but only the
+        # Network domain - Page/tracing events would just bloat the log
+        # stream we later have to filter in _extract_session_data
+        options.set_capability("goog:loggingPrefs", {"performance": "INFO", "browser": "OFF"})
+        options.add_experimental_option("perfLoggingPrefs", {
+            "enableNetwork": True,
+            "enablePage": False,
+            "traceCategories": ""
+        })
         
         try:
-            service = ChromeService(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=options)
-            
+            if self._driver_server_url:
+                # Open a session on the shared chromedriver server rather
+                # than forking a new chromedriver per worker
+                driver = webdriver.Remote(
+                    command_executor=self._driver_server_url, options=options
+                )
+            else:
+                service = ChromeService(executable_path=self._resolve_driver_path())
+                driver = webdriver.Chrome(service=service, options=options)
+
             # Execute stealth script
             driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
+
+            # Bound Chrome's network-event buffers and drop asset requests
+            # that can never contribute to the users/@me header capture
+            try:
+                driver.execute_cdp_cmd("Network.enable", {
+                    "maxTotalBufferSize": 1_048_576,
+                    "maxResourceBufferSize": 262_144
+                })
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {
+                    "urls": ["*.png", "*.jpg", "*.svg", "*.woff*", "*.mp4"]
+                })
+            except WebDriverException as e:
+                self.logger.warning(f"Failed to configure CDP network limits: {e}")
+
             return driver
             
         except WebDriverException as e:
             self.logger.error(f"Failed to create WebDriver: {e}")
             raise
     
-    async def _capture_account_session(self, driver, account):
-        """Capture session data for a specific account"""
+    def _reset_driver(self, driver):
+        """Clear per-account browser state between captures, keeping the driver alive"""
+        try:
+            driver.delete_all_cookies()
+            driver.execute_script("window.localStorage.clear(); location.replace('about:blank')")
+        except Exception as e:
+            self.logger.warning(f"Driver reset failed: {e}")
+
+    def _capture_account_session(self, driver, account):
+        """Capture session data for a specific account
+
+        Runs synchronously inside a worker thread (see _capture_worker).
+
+        Expects the driver parked on about:blank (or fresh); navigates to a
+        cheap, cacheable discord.com page to get an origin for token injection
+        rather than loading the full login app.
+        """
         try:
-            # Navigate to Discord login
-            self.logger.info(f"Navigating to Discord login for {account.email}")
+            # Navigate to Discord origin for the token injection
+            self.logger.info(f"Navigating to Discord for {account.email}")
             driver.get("https://discord.com/login")
             WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
             
-            # Check for Cloudflare
-            if "cloudflare" in driver.page_source.lower():
+            # Check for Cloudflare with a targeted JS probe - grepping
+            # driver.page_source serializes the whole DOM over IPC
+            is_cf = driver.execute_script(
+                "return !!document.querySelector('#challenge-form,#cf-challenge-running')"
+                " || /just a moment/i.test(document.title)"
+            )
+            if is_cf:
                 self.logger.warning("Cloudflare challenge detected")
             
-            # Execute login script
+            # Single-shot token injection: write the token through a throwaway
+            # iframe and reload immediately - no timers, no fixed delays. The
+            # token is interpolated via json.dumps so arbitrary characters
+            # can't break out of the script.
             self.logger.info(f"Executing login script for {account.email}")
-            login_script = f"""
-            const token = '{account.token}';
-            
-            function login(token) {{
-                setInterval(() => {{
-                    document.body.appendChild(document.createElement('iframe')).contentWindow.localStorage.token = `"${{token}}"`;
-                }}, 50);
-                setTimeout(() => {{
-                    location.reload();
-                }}, 2500);
-            }}
-            
-            login(token);
-            """
-            
+            login_script = """
+            (function(t){
+                const f = document.createElement('iframe');
+                document.body.appendChild(f);
+                f.contentWindow.localStorage.setItem('token', JSON.stringify(t));
+                f.remove();
+                location.reload();
+            })(%s);
+            """ % json.dumps(account.token)
+
             driver.execute_script(login_script)
-            
-            # Wait for login
+
+            # Wait for the post-reload page to pick the token up
             self.logger.info("Waiting for login completion")
-            time.sleep(15)
-            
-            # Navigate to channels
+            login_wait = self.config.get('browser', {}).get('login_wait_time', 15)
+            try:
+                WebDriverWait(driver, login_wait, poll_frequency=0.1).until(
+                    lambda d: d.execute_script("return !!window.localStorage.getItem('token')")
+                    or "channels/@me" in d.current_url
+                )
+            except TimeoutException:
+                self.logger.warning(f"Token injection not confirmed for {account.email}")
+
+            # Navigate to channels and wait for the app to actually render,
+            # not just for a <body> tag (which fires before login completes)
             driver.get("https://discord.com/channels/@me")
-            WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+            try:
+                WebDriverWait(driver, 15, poll_frequency=0.25).until(
+                    lambda d: d.execute_script(
+                        "return !!document.querySelector('[class*=\"chatContent\"],[class*=\"sidebar\"]')"
+                    ) or "login" in d.current_url
+                )
+            except TimeoutException:
+                self.logger.warning(f"Discord app did not finish loading for {account.email}")
             
             # Check login success
             current_url = driver.current_url
@@ -204,24 +555,39 @@ class BrowserSessionAcquisition:
         try:
             # Get performance logs for network requests
             performance_logs = driver.get_log("performance")
-            
+
+            # The log is typically thousands of entries, nearly all of them
+            # irrelevant CDP events. A cheap substring check filters them out
+            # before paying for a full JSON parse; only candidate entries are
+            # decoded, and the loop stops at the first match. Bound lookups
+            # are hoisted out of the loop to cut interpreter dispatch.
             headers = {}
+            _loads = json.loads
+            _users_me_search = _USERS_ME_RE.search
             for log_entry in performance_logs:
+                msg = log_entry["message"]
+                if _REQ_WILL_BE_SENT not in msg or not _users_me_search(msg):
+                    continue
                 try:
-                    log = json.loads(log_entry["message"])["message"]
+                    log = _loads(msg)["message"]
                     if log["method"] == "Network.requestWillBeSent":
-                        url = log["params"]["request"]["url"]
-                        if "api/v" in url and "users/@me" in url:
-                            headers = log["params"]["request"].get("headers", {})
+                        request = log["params"]["request"]
+                        if _users_me_search(request["url"]):
+                            headers = request.get("headers", {})
                             break
                 except (json.JSONDecodeError, KeyError):
                     continue
             
-            # Get cookies
+            # Get cookies in one CDP call - driver.get_cookies() only covers
+            # the current page and needs several round-trips through chromedriver
             cookies = {}
             try:
-                selenium_cookies = driver.get_cookies()
-                cookies = {cookie['name']: cookie['value'] for cookie in selenium_cookies}
+                resp = driver.execute_cdp_cmd("Network.getAllCookies", {})
+                cookies = {
+                    c['name']: c['value']
+                    for c in resp.get('cookies', [])
+                    if c.get('domain', '').endswith('discord.com')
+                }
             except Exception as e:
                 self.logger.warning(f"Failed to get cookies: {e}")
             
@@ -249,34 +615,7 @@ class BrowserSessionAcquisition:
     
     def _generate_fallback_headers(self, token):
         """Generate fallback headers when capture fails"""
-        import base64
-        
-        super_properties = {
-            "os": "Windows",
-            "browser": "Chrome", 
-            "device": "",
-            "system_locale": "en-US",
-            "browser_user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36",
-            "browser_version": "136.0.0.0",
-            "os_version": "10",
-            "referrer": "",
-            "referring_domain": "",
-            "referrer_current": "https://discord.com/",
-            "referring_domain_current": "discord.com",
-            "release_channel": "stable",
-            "client_build_number": 423077
-        }
-        
-        return {
-            "Content-Type": "application/json",
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36",
-            "Accept": "*/*",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Authorization": token,
-            "Origin": "https://discord.com",
-            "Referer": "https://discord.com/channels/@me",
-            "X-Super-Properties": base64.b64encode(json.dumps(super_properties).encode()).decode()
-        }
+        return {**_STATIC_FALLBACK_HEADERS, "Authorization": token}
     
     def _generate_fallback_session_data(self, account):
         """Generate fallback session data"""
@@ -295,10 +634,18 @@ class BrowserSessionAcquisition:
         try:
             # Ensure data directory exists
             self.session_file.parent.mkdir(exist_ok=True)
-            
-            with open(self.session_file, 'w') as f:
-                json.dump(session_data, f, indent=2)
-                
+
+            # Write compact JSON to a temp file and atomically swap it in,
+            # so a crash mid-write can't leave a corrupt session file
+            if orjson:
+                payload = orjson.dumps(session_data)
+            else:
+                payload = json.dumps(session_data, separators=(',', ':')).encode()
+
+            tmp = self.session_file.with_suffix('.json.tmp')
+            tmp.write_bytes(payload)
+            os.replace(tmp, self.session_file)
+
             self.logger.info(f"Session data saved to {self.session_file}")
             
         except Exception as e:
@@ -3,31 +3,66 @@ Discord Username Monitor - CAPTCHA Solver
 Handles hCaptcha solving using external services
 """
 
-import requests
 import time
+import random
 import asyncio
+import aiohttp
 from utils.logger import get_logger
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_body(payload):
+    """Serialize a request payload, preferring orjson when available"""
+    if orjson:
+        return orjson.dumps(payload)
+    import json
+    return json.dumps(payload).encode()
+
 
 class CaptchaSolver:
     """Handles CAPTCHA solving"""
-    
+
     def __init__(self, config):
         self.config = config
         self.logger = get_logger(__name__)
-        
+
         # Load from config
         self.service_url = config.get('captcha', {}).get('service_url', 'https://freecaptchabypass.com')
         self.client_key = config.get('captcha', {}).get('client_key', '')
         self.timeout = config.get('captcha', {}).get('timeout', 120)
         self.enabled = config.get('captcha', {}).get('enabled', False)
-    
+
+        self._session = None
+
+    def _get_session(self):
+        """Get the shared aiohttp session, creating it lazily on the running loop"""
+        if self._session is None or self._session.closed:
+            # Small keep-alive pool: a 120s solve polls ~20 times, and without
+            # connection reuse each poll would pay a fresh TCP+TLS handshake
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=4, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=10),
+                headers={"Content-Type": "application/json"}
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
     async def solve_hcaptcha(self, sitekey, rqdata=None):
         """Solve hCaptcha using external service"""
         if not self.enabled or not self.client_key:
             self.logger.warning("CAPTCHA solver not configured")
             return None
-            
+
+        session = self._get_session()
         task_id = None
         try:
             # Create captcha task
@@ -40,40 +75,50 @@ class CaptchaSolver:
                     "data": rqdata
                 }
             }
-            
-            response = requests.post(
-                f"{self.service_url}/createTask",
-                json=task_payload,
-                timeout=10
-            )
-            self.logger.debug(f"createTask status={response.status_code}, body={response.text}")
-            
-            if response.status_code == 200:
-                task_data = response.json()
-                if task_data.get("errorId") == 0:
-                    task_id = task_data["taskId"]
-            
+
+            async with session.post(f"{self.service_url}/createTask", data=_json_body(task_payload)) as response:
+                body = await response.text()
+                self.logger.debug(f"createTask status={response.status}, body={body}")
+
+                if response.status == 200:
+                    task_data = await response.json(content_type=None)
+                    if task_data.get("errorId") == 0:
+                        task_id = task_data["taskId"]
+
             if not task_id:
                 return None
 
-            # Poll for solution
-            start_time = time.time()
-            while time.time() - start_time < self.timeout:
-                await asyncio.sleep(5)
-                
-                result_payload = {"clientKey": self.client_key, "taskId": task_id}
-                result_response = requests.post(
-                    f"{self.service_url}/getTaskResult",
-                    json=result_payload,
-                    timeout=10
-                )
-                self.logger.debug(f"getTaskResult status={result_response.status_code}, body={result_response.text}")
-                
-                if result_response.status_code == 200:
-                    result_data = result_response.json()
-                    if result_data.get("status") == "ready":
-                        return result_data["solution"]["gRecaptchaResponse"]
-        
+            # Poll for solution with exponential backoff + jitter: fast solves
+            # are picked up within ~1s while slow ones back off to a 5s cap
+            deadline = time.monotonic() + self.timeout
+            delay = 1.0
+            result_body = _json_body({"clientKey": self.client_key, "taskId": task_id})
+
+            while time.monotonic() < deadline:
+                await asyncio.sleep(delay + random.uniform(0, 0.3 * delay))
+
+                async with session.post(f"{self.service_url}/getTaskResult", data=result_body) as result_response:
+                    body = await result_response.text()
+                    self.logger.debug(f"getTaskResult status={result_response.status}, body={body}")
+
+                    retry_after = result_response.headers.get('Retry-After')
+
+                    if result_response.status == 200:
+                        result_data = await result_response.json(content_type=None)
+                        status = result_data.get("status")
+                        if status == "ready":
+                            return result_data["solution"]["gRecaptchaResponse"]
+                        if status in ("failed", "error") or result_data.get("errorId", 0) != 0:
+                            self.logger.warning(f"CAPTCHA task failed: {result_data}")
+                            return None
+
+                delay = min(delay * 1.5, 5.0)
+                if retry_after:
+                    try:
+                        delay = max(delay, float(retry_after))
+                    except ValueError:
+                        pass
+
         except Exception as e:
             self.logger.error(f"CAPTCHA solving failed: {str(e)}")
-        return None
\ No newline at end of file
+        return None
@@ -3,16 +3,21 @@ Discord Username Monitor - Core monitoring logic
 """
 
 import asyncio
+import json
+import os
 import random
+import re
+import sys
 import time
 import threading
 from datetime import datetime
+import itertools
 from itertools import cycle
 from concurrent.futures import ThreadPoolExecutor
-import requests
 
+from curl_cffi import CurlOpt
 from curl_cffi import requests as curl_requests
-from pystyle import Colors, Write
+from pystyle import Colors
 
 from .session_manager import SessionManager
 from .browser_session import BrowserSessionAcquisition
@@ -20,9 +25,43 @@ from .captcha_solver import CaptchaSolver
 from utils.webhook_manager import WebhookManager
 from utils.proxy_manager import ProxyManager
 from utils.account_parser import AccountParser
+from utils.io import prompt
 from utils.logger import get_logger
 from models.account import Account
-from models.username import Username
+from models.username import Username, UsernameTable
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Headers for the unauthenticated availability check - nothing here varies
+# at runtime, so the dict is built once instead of per request
+_CHECK_BATCH_SIZE = 8  # concurrent streams per worker iteration
+
+# Names safe to splice into a JSON body without escaping; anything else
+# (possible in user-supplied wordlists) takes the real-encoder path
+_SAFE_NAME = re.compile(r'[a-z0-9._]+')
+
+_CHECK_HEADERS = {
+    "Content-Type": "application/json",
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36",
+    "Accept": "*/*",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br, zstd",
+    "Origin": "https://discord.com",
+    "Referer": "https://discord.com/",
+    "Sec-Ch-Ua": '"Chromium";v="136", "Google Chrome";v="136", "Not.A/Brand";v="99"',
+    "Sec-Ch-Ua-Mobile": "?0",
+    "Sec-Ch-Ua-Platform": '"Windows"',
+    "Sec-Fetch-Dest": "empty",
+    "Sec-Fetch-Mode": "cors",
+    "Sec-Fetch-Site": "same-origin",
+    "X-Discord-Locale": "en-US",
+    "X-Discord-Timezone": "America/New_York",
+    "Connection": "keep-alive"
+}
+
 
 class DiscordUsernameMonitor:
     """Main Discord username monitoring class"""
@@ -50,16 +89,185 @@ class DiscordUsernameMonitor:
             'rate_limited_count': 0,
             'start_time': time.time()
         }
-        
+
+        # Check counter: itertools.count.__next__ is a single C call, safe
+        # under the GIL, so workers don't need a lock just to increment.
+        # Position and cycle counts are derived from it at read time.
+        self._checked_counter = itertools.count(1)
+        self._checked_count = 0
+
         # Threading
         self.stop_event = threading.Event()
         self.lock = threading.Lock()
         
+        # Interactive settings (filled in by prompt_configuration)
+        self.mode = 'n'
+        self.thread_count = 12
+        self.delay_range = (0.2, 1.5)
+        self._username_source = 'g'
+        self._username_count = 1000
+        self._username_length = 4
+
         # Data storage
         self.accounts = []
+        self._account_cycle = None
         self.username_list = []
-        self.username_cycle = None
-        self.username_status = {}
+
+        # Contiguous username storage for fixed-length lists: one bytes
+        # blob indexed by position instead of a heap-scattered str list
+        self._username_blob = None
+        self._username_len = 0
+        self._username_n = 0
+        self._username_pos = 0
+
+        # Columnar per-name status/check-count bookkeeping, index-aligned
+        # with the list/blob position (see models.username.UsernameTable)
+        self.username_table = None
+
+        # Shared HTTP session - created after thread_count is known so the
+        # client pool can be sized to the worker count
+        self._http = None
+        self._dns_entries = None
+
+        # Shared pacing state: one token-bucket interval between sends for
+        # the whole worker pool, widened on 429s and relaxed on successes
+        self._pace_lock = None
+        self._base_interval = 0.0
+        self._min_interval = 0.0
+        self._last_send = 0.0
+        self._ok_streak = 0
+
+        # Batched results writer - workers enqueue hit lines, a single task
+        # flushes them so no worker blocks on disk IO
+        self._log_queue = None
+        self._log_writer_task = None
+
+        # Loop-bound shutdown signal (created once the loop is running)
+        self._stop_async = None
+
+        # Concurrency cap for direct (no-proxy) requests
+        self._direct_sem = None
+
+        # Bulk-precomputed jitter samples (see _next_jitter)
+        self._jitter_buf = ()
+        self._jitter_i = 0
+
+        # Skip stats writes when nothing changed (see _save_session_stats)
+        self._last_stats_fingerprint = None
+
+    def _refresh_stats(self):
+        """Fold the lock-free counters into the stats dict for readers"""
+        n = self._checked_count
+        total = self._username_n or len(self.username_list) or 1
+        self.stats['checked_count'] = n
+        self.stats['current_position'] = n % total
+        self.stats['cycles_completed'] = n // total
+
+    def _next_jitter(self):
+        """Return a uniform [0, 1) jitter sample from a precomputed buffer
+
+        Samples are drawn 4096 at a time in one C-level call when NumPy is
+        available, so hot-path callers pay an array index instead of a
+        Python-level RNG call per sample.
+        """
+        if self._jitter_i >= len(self._jitter_buf):
+            try:
+                import numpy as np
+                self._jitter_buf = np.random.default_rng().uniform(0.0, 1.0, 4096)
+            except ImportError:
+                return random.random()
+            self._jitter_i = 0
+        value = self._jitter_buf[self._jitter_i]
+        self._jitter_i += 1
+        return value
+
+    async def _pace(self):
+        """Sleep until the shared inter-request interval has elapsed
+
+        Serializes send scheduling across workers so the pool as a whole
+        respects one adaptive rate instead of every worker racing with an
+        independent random delay.
+        """
+        async with self._pace_lock:
+            now = time.monotonic()
+            wait = self._last_send + self._min_interval - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+                now = time.monotonic()
+            self._last_send = now
+
+    def _note_rate_limited(self):
+        """AIMD increase: widen the shared send interval after a 429"""
+        widened = max(self._min_interval, self._base_interval) * 2 * (1 + self._next_jitter() * 0.5)
+        self._min_interval = min(widened, 30.0)
+        self._ok_streak = 0
+
+    def _note_success(self):
+        """AIMD decrease: relax the interval after 20 consecutive successes
+
+        Decreasing only on a sustained clean streak (rather than every
+        200) lets the rate converge to the maximum the endpoint sustains
+        instead of oscillating around the limit.
+        """
+        if self._min_interval <= self._base_interval:
+            return
+        self._ok_streak += 1
+        if self._ok_streak >= 20:
+            self._ok_streak = 0
+            self._min_interval = max(self._base_interval, self._min_interval * 0.95)
+
+    def _resolve_discord_dns(self):
+        """Resolve discord.com once so libcurl skips per-connect lookups
+
+        Returns CURLOPT_RESOLVE-style entries, or None when a proxy is in
+        use (resolution happens at the proxy) or the lookup fails.
+        """
+        if self.proxy_manager.has_proxies():
+            return None
+
+        import socket
+        try:
+            infos = socket.getaddrinfo("discord.com", 443, type=socket.SOCK_STREAM)
+            ips = ",".join(dict.fromkeys(info[4][0] for info in infos))
+            return [f"discord.com:443:{ips}"] if ips else None
+        except OSError as e:
+            self.logger.warning(f"DNS prewarm failed: {e}")
+            return None
+
+    def _create_http_session(self):
+        """Create the shared impersonated HTTP/2 session for all workers
+
+        One long-lived AsyncSession keeps connections to discord.com open
+        and multiplexes checks over them instead of paying a fresh TCP+TLS
+        handshake per request.
+        """
+        self._dns_entries = self._resolve_discord_dns()
+        kwargs = {}
+        if self._dns_entries:
+            # AsyncSession has no first-class kwarg for DNS pinning;
+            # CURLOPT_RESOLVE goes through the raw curl_options dict
+            kwargs["curl_options"] = {CurlOpt.RESOLVE: self._dns_entries}
+
+        max_clients = self.thread_count * 2
+        if self.proxy_manager.has_proxies():
+            # Bound concurrent tunnels to the proxy pool size
+            max_clients = min(max_clients, self.proxy_manager.proxy_count() * 2)
+
+        self._http = curl_requests.AsyncSession(
+            impersonate="chrome136",
+            max_clients=max(max_clients, 1),
+            allow_redirects=False,
+            **kwargs
+        )
+
+    async def _close_http_session(self):
+        """Close the shared HTTP session"""
+        if self._http is not None:
+            try:
+                await self._http.close()
+            except Exception as e:
+                self.logger.warning(f"Error closing HTTP session: {e}")
+            self._http = None
         
     async def start(self):
         """Start the monitoring system"""
@@ -103,7 +311,12 @@ class DiscordUsernameMonitor:
         
         if not self.accounts:
             raise ValueError("No valid accounts loaded")
-            
+
+        # Round-robin claiming spreads hits evenly over accounts; random
+        # choice could burn one account's rate budget twice in a row
+        random.shuffle(self.accounts)
+        self._account_cycle = cycle(self.accounts)
+
         print(f"✓ Loaded {len(self.accounts)} accounts")
     
     async def _acquire_browser_sessions(self):
@@ -126,15 +339,40 @@ class DiscordUsernameMonitor:
         else:
             print("! No webhooks configured - notifications disabled")
     
+    def prompt_configuration(self):
+        """Collect every interactive setting before the event loop starts
+
+        pystyle's animated Input blocks wherever it runs, so all prompts
+        happen here synchronously (with the per-character animation
+        disabled) instead of stalling coroutines later.
+        """
+        print(f"\n{Colors.cyan}━━━ Configuration ━━━{Colors.white}")
+
+        self._username_source = prompt(
+            'Username source - (f)ile, (d)ictionary, or (g)enerate: '
+        ).lower()
+
+        if self._username_source == 'g':
+            self._username_count = int(prompt('Number of usernames (100-5000): ') or "1000")
+            self._username_length = int(prompt('Username length (2-12): ') or "4")
+
+        self.mode = prompt(
+            'Monitoring mode - (a)uto-claim or (n)otifications-only: '
+        ).lower()
+
+        self.thread_count = int(prompt('Worker threads (1-25, recommended: 12): ') or "12")
+
+        self.delay_range = (
+            float(prompt('Min delay (seconds): ') or "0.2"),
+            float(prompt('Max delay (seconds): ') or "1.5")
+        )
+
     async def _setup_username_list(self):
         """Setup username list for monitoring"""
         print("Setting up username list...")
-        
-        source = Write.Input(
-            'Username source - (f)ile, (d)ictionary, or (g)enerate: ',
-            Colors.blue_to_cyan, interval=0.02
-        ).lower()
-        
+
+        source = self._username_source
+
         if source == 'f':
             self.username_list = await self._load_username_file()
         elif source == 'd':
@@ -147,8 +385,26 @@ class DiscordUsernameMonitor:
         if not self.username_list:
             self.username_list = ['test', 'user', 'name']
             
-        self.username_cycle = cycle(self.username_list)
-        print(f"✓ Username list ready: {len(self.username_list)} usernames")
+        # Columnar status table, index-aligned with list/blob position
+        self.username_table = UsernameTable(self.username_list)
+
+        # Fixed-length lists are packed into one contiguous ASCII blob so
+        # the hot cycle walks memory serially instead of chasing pointers
+        lengths = {len(u) for u in self.username_list}
+        if len(lengths) == 1:
+            try:
+                self._username_blob = ''.join(self.username_list).encode('ascii')
+                self._username_len = lengths.pop()
+                self._username_n = len(self.username_list)
+                self._username_pos = 0
+                self.username_list = []
+                # Names live in the blob now; keep only the status columns
+                self.username_table.release_names()
+            except UnicodeEncodeError:
+                self._username_blob = None
+
+        total = self._username_n or len(self.username_list)
+        print(f"✓ Username list ready: {total} usernames")
     
     async def _configure_proxies(self):
         """Configure proxy rotation"""
@@ -162,24 +418,12 @@ class DiscordUsernameMonitor:
             print("✓ Direct connection mode")
     
     async def _configure_monitoring(self):
-        """Configure monitoring parameters"""
-        print("Configuring monitoring parameters...")
-        
-        self.mode = Write.Input(
-            'Monitoring mode - (a)uto-claim or (n)otifications-only: ',
-            Colors.blue_to_cyan, interval=0.02
-        ).lower()
-        
-        self.thread_count = int(Write.Input(
-            'Worker threads (1-25, recommended: 12): ',
-            Colors.blue_to_cyan, interval=0.02
-        ) or "12")
-        
-        self.delay_range = (
-            float(Write.Input('Min delay (seconds): ', Colors.blue_to_cyan, interval=0.02) or "0.2"),
-            float(Write.Input('Max delay (seconds): ', Colors.blue_to_cyan, interval=0.02) or "1.5")
-        )
-        
+        """Apply monitoring parameters collected by prompt_configuration"""
+        # Target aggregate rate: one request per mean delay per worker
+        mean_delay = (self.delay_range[0] + self.delay_range[1]) / 2
+        self._base_interval = mean_delay / max(self.thread_count, 1)
+        self._min_interval = self._base_interval
+
         print(f"✓ Monitoring configured: {self.thread_count} threads, {self.mode} mode")
     
     async def _run_monitoring(self):
@@ -187,128 +431,184 @@ class DiscordUsernameMonitor:
         print(f"\n{Colors.green}Starting username monitoring...{Colors.white}")
         print("Press Ctrl+C to stop\n")
         print("=" * 80)
-        
-        # Start worker tasks
+
+        self._create_http_session()
+        self._pace_lock = asyncio.Lock()
+        self._stop_async = asyncio.Event()
+        self._direct_sem = asyncio.Semaphore(self.thread_count)
+        self._log_queue = asyncio.Queue()
+        self._log_writer_task = asyncio.create_task(self._log_writer())
+
         tasks = []
-        for i in range(self.thread_count):
-            task = asyncio.create_task(self._worker(i + 1))
-            tasks.append(task)
-        
-        # Start statistics updater
-        stats_task = asyncio.create_task(self._stats_updater())
-        
         try:
-            # Wait for tasks to complete
-            await asyncio.gather(*tasks, stats_task)
+            if sys.version_info >= (3, 11):
+                # TaskGroup cancels every sibling as soon as one task fails,
+                # so an error or Ctrl+C can't leave zombie workers holding
+                # sockets while shutdown waits
+                async with asyncio.TaskGroup() as tg:
+                    for i in range(self.thread_count):
+                        tg.create_task(self._worker(i + 1))
+                    tg.create_task(self._stats_updater())
+            else:
+                for i in range(self.thread_count):
+                    tasks.append(asyncio.create_task(self._worker(i + 1)))
+                tasks.append(asyncio.create_task(self._stats_updater()))
+                await asyncio.gather(*tasks)
+
         except KeyboardInterrupt:
             print(f"\n\n{Colors.yellow}Shutdown requested...{Colors.white}")
             self.stop_event.set()
-            
-            # Cancel all tasks
-            for task in tasks + [stats_task]:
+            self._stop_async.set()
+
+            # Cancel leftover tasks (gather fallback only; TaskGroup has
+            # already cancelled its children by the time we get here)
+            for task in tasks:
                 task.cancel()
-            
-            # Wait for cancellation
-            await asyncio.gather(*tasks, stats_task, return_exceptions=True)
-            
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
         finally:
+            if self._log_writer_task:
+                self._log_writer_task.cancel()
+                try:
+                    await self._log_writer_task
+                except asyncio.CancelledError:
+                    pass
+            await self._close_http_session()
+            # Drain the coalesced notifications and release the shared
+            # aiohttp pools alongside our own session
+            await self.webhook_manager.close()
+            await self.captcha_solver.close()
             await self._display_final_results()
     
     async def _worker(self, worker_id):
         """Worker coroutine for monitoring usernames"""
         worker_name = f"Worker-{worker_id}"
-        
+
+        # Sticky proxy: keeping one proxy per worker preserves the CONNECT
+        # tunnel and upstream TLS session across requests; rotate only when
+        # the proxy gets rate limited or errors out
+        proxy = self.proxy_manager.assign_worker(worker_id)
+
         while not self.stop_event.is_set():
             try:
-                # Get next username
-                username = next(self.username_cycle)
-                
-                # Add delay
-                delay = random.uniform(*self.delay_range)
-                await asyncio.sleep(delay)
-                
-                # Check availability
-                is_available, retry_after = await self._check_username_availability(username)
-                
-                # Handle rate limiting
-                if retry_after > 0:
-                    await asyncio.sleep(retry_after)
-                    continue
-                
-                # Update statistics
-                with self.lock:
-                    self.stats['checked_count'] += 1
-                    self.stats['current_position'] += 1
-                    
-                    if self.stats['current_position'] >= len(self.username_list):
-                        self.stats['current_position'] = 0
-                        self.stats['cycles_completed'] += 1
-                
-                # Handle availability
-                if is_available:
-                    await self._handle_available_username(username, worker_name)
-                
-                # Update display periodically
-                if self.stats['checked_count'] % 25 == 0:
-                    self._display_stats()
-                    
+                # Pull a batch and check it concurrently - the shared session
+                # multiplexes all of these as HTTP/2 streams on one connection
+                batch = [self._next_username() for _ in range(_CHECK_BATCH_SIZE)]
+                for idx, _ in batch:
+                    self.username_table.mark_checking(idx)
+                results = await asyncio.gather(
+                    *[self._check_one(name, proxy) for _, name in batch],
+                    return_exceptions=True
+                )
+
+                backoff = 0.0
+                trouble = False
+                for (idx, username), result in zip(batch, results):
+                    if isinstance(result, Exception):
+                        self.logger.error(f"Worker {worker_id} check error for {username}: {result}")
+                        trouble = True
+                        continue
+
+                    is_available, retry_after = result
+
+                    # Handle rate limiting - back off once for the whole batch
+                    if retry_after > 0:
+                        backoff = max(backoff, retry_after)
+                        trouble = True
+                        continue
+
+                    # Update statistics (lock-free; see _checked_counter)
+                    self._checked_count = next(self._checked_counter)
+
+                    # Handle availability
+                    if is_available:
+                        self.username_table.mark_available(idx)
+                        await self._handle_available_username(username, worker_name)
+                    else:
+                        self.username_table.mark_taken(idx)
+
+                if trouble:
+                    proxy = self.proxy_manager.rotate_worker(worker_id) or proxy
+                if backoff > 0:
+                    await asyncio.sleep(backoff)
+
             except Exception as e:
                 self.logger.error(f"Worker {worker_id} error: {e}")
                 await asyncio.sleep(5)
-    
+
+    def _next_username(self):
+        """Next (index, name) in the cycle (blob-indexed for fixed-length lists)"""
+        i = self._username_pos
+        if self._username_blob is not None:
+            self._username_pos = (i + 1) % self._username_n
+            length = self._username_len
+            return i, self._username_blob[i * length:(i + 1) * length].decode('ascii')
+        self._username_pos = (i + 1) % len(self.username_list)
+        return i, self.username_list[i]
+
+    async def _check_one(self, username, proxy=None):
+        """Pace then check one username (a single HTTP/2 stream)"""
+        await self._pace()
+        return await self._check_username_availability(username, proxy)
+
     def _get_check_headers(self):
-        """Generate headers for username availability check"""
-        return {
-            "Content-Type": "application/json",
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36",
-            "Accept": "*/*",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "gzip, deflate, br, zstd",
-            "Origin": "https://discord.com",
-            "Referer": "https://discord.com/",
-            "Sec-Ch-Ua": '"Chromium";v="136", "Google Chrome";v="136", "Not.A/Brand";v="99"',
-            "Sec-Ch-Ua-Mobile": "?0",
-            "Sec-Ch-Ua-Platform": '"Windows"',
-            "Sec-Fetch-Dest": "empty",
-            "Sec-Fetch-Mode": "cors",
-            "Sec-Fetch-Site": "same-origin",
-            "X-Discord-Locale": "en-US",
-            "X-Discord-Timezone": "America/New_York",
-            "Connection": "keep-alive"
-        }
-        
-    async def _check_username_availability(self, username):
+        """Headers for username availability check (module-level constant)"""
+        return _CHECK_HEADERS
+
+    async def _check_username_availability(self, username, proxy=None):
         """Check if a username is available"""
-        session = curl_requests.Session(impersonate="chrome136")
-        
-        # Apply proxy if available
-        proxy = self.proxy_manager.get_proxy()
-        if proxy:
-            session.proxies = {"http": proxy, "https": proxy}
-        
+        proxies = {"http": proxy, "https": proxy} if proxy else None
+        sem = self.proxy_manager.sem_for(proxy) if proxy else self._direct_sem
+
         try:
-            response = session.post(
-                "https://discord.com/api/v9/unique-username/username-attempt-unauthed",
-                json={"username": username},
-                headers=self._get_check_headers(),
-                timeout=15
-            )
+            # Generated names are [a-z0-9._]-clean, so the common case
+            # composes the body as bytes directly; wordlist entries that
+            # fail the check get a real JSON encode so quotes and
+            # backslashes escape properly
+            if _SAFE_NAME.fullmatch(username):
+                body = b'{"username":"%s"}' % username.encode()
+            elif orjson is not None:
+                body = orjson.dumps({"username": username})
+            else:
+                body = json.dumps({"username": username}).encode()
+
+            async with sem:
+                response = await self._http.post(
+                    "https://discord.com/api/v9/unique-username/username-attempt-unauthed",
+                    data=body,
+                    headers=_CHECK_HEADERS,
+                    proxies=proxies,
+                    timeout=15
+                )
             
             if response.status_code == 200:
-                data = response.json()
+                self._note_success()
+                # The schema is a fixed {"taken": bool}, so a substring
+                # scan beats a full JSON parse on the hot path
+                raw = response.content
+                if b'"taken":false' in raw or b'"taken": false' in raw:
+                    self.session_manager.note_available(username)
+                    return True, 0
+                if b'"taken":true' in raw or b'"taken": true' in raw:
+                    self.session_manager.note_taken(username)
+                    return False, 0
+                # Schema drift guard: fall back to a real parse
+                loads = orjson.loads if orjson is not None else json.loads
+                data = loads(raw)
                 return not data.get('taken', True), 0
-                
+
             elif response.status_code == 429:
                 retry_after = float(response.headers.get('Retry-After', 5))
-                
+                self._note_rate_limited()
+
                 with self.lock:
                     self.stats['rate_limited_count'] += 1
-                
-                # Optimize retry delay with proxies
-                if proxy and retry_after > 3.0:
-                    return False, 0.5  # Quick proxy rotation
-                else:
-                    return False, min(retry_after, 10.0)
+
+                # Jittered adaptive back-off, floored by what the server
+                # asked for, so retrying workers don't re-land in sync
+                delay = max(retry_after, self._min_interval) * random.uniform(0.5, 1.5)
+                return False, min(delay, 30.0)
             
             else:
                 self.logger.warning(f"Unexpected status {response.status_code} for {username}")
@@ -317,61 +617,6 @@ class DiscordUsernameMonitor:
         except Exception as e:
             self.logger.error(f"Check error for {username}: {e}")
             return False, 5
-    
-    
-        # CAPTCHA SOLVER METHOD 
-    def solve_hcaptcha(self, sitekey, rqdata=None):
-        """Solve hCaptcha using external service"""
-        task_id = None
-        try:
-            # Create captcha task
-            task_payload = {
-                "clientKey": self.captcha_client_key,
-                "task": {
-                    "type": "HCaptchaEnterpriseTask",
-                    "websiteURL": "https://discord.com",
-                    "websitePublicKey": sitekey,
-                    # "isInvisible": False,
-                    "data": rqdata
-                }
-            }
-            
-            response = requests.post(
-                f"{self.captcha_service_url}/createTask",
-                json=task_payload,
-                timeout=10
-            )
-            print(f"[DEBUG] createTask status={response.status_code}, body={response.text}")
-            
-            if response.status_code == 200:
-                task_data = response.json()
-                if task_data.get("errorId") == 0:
-                    task_id = task_data["taskId"]
-            
-            if not task_id:
-                return None
-
-            # Poll for solution
-            start_time = time.time()
-            while time.time() - start_time < 120:  # 2 min timeout
-                time.sleep(5)
-                result_payload = {"clientKey": self.captcha_client_key, "taskId": task_id}
-                result_response = requests.post(
-                    f"{self.captcha_service_url}/getTaskResult",
-                    json=result_payload,
-                    timeout=10
-                )
-                print(f"[DEBUG] getTaskResult status={result_response.status_code}, body={result_response.text}")
-                
-                if result_response.status_code == 200:
-                    result_data = result_response.json()
-                    if result_data.get("status") == "ready":
-                        return result_data["solution"]["gRecaptchaResponse"]
-        
-        except Exception as e:
-            self.log_error(f"CAPTCHA solving failed: {str(e)}")
-        return None
-
     async def _handle_available_username(self, username, worker_name):
         """Handle when a username becomes available"""
         print(f"\n{Colors.green}🎯 [{worker_name}] {username} is AVAILABLE!{Colors.white}")
@@ -407,8 +652,8 @@ class DiscordUsernameMonitor:
             return False
     
     def _get_next_account(self):
-        """Get next account for claiming"""
-        return random.choice(self.accounts)
+        """Get next account for claiming (round-robin over a shuffled cycle)"""
+        return next(self._account_cycle)
     
     def _log_available_username(self, username, account):
         """Log available username immediately"""
@@ -417,18 +662,48 @@ class DiscordUsernameMonitor:
         # Save to results file
         result_line = f"{username}:{account.email}:{account.password or 'N/A'}:{account.token}\n"
         
+        if self._log_queue is not None:
+            self._log_queue.put_nowait(result_line)
+        else:
+            self._append_result_lines([result_line])
+
+        self.logger.info(f"AVAILABLE: {username} - {account.email}")
+
+    def _append_result_lines(self, lines):
+        """Append a batch of result lines in one write"""
         try:
             with open("results/available_usernames.txt", "a", encoding="utf-8") as f:
-                f.write(result_line)
-                f.flush()
-                
-            self.logger.info(f"AVAILABLE: {username} - {account.email}")
-            
+                f.writelines(lines)
         except Exception as e:
-            self.logger.error(f"Failed to log available username: {e}")
-    
+            self.logger.error(f"Failed to log available usernames: {e}")
+
+    async def _log_writer(self):
+        """Drain the log queue and flush results in batches off the loop"""
+        buffer = []
+        try:
+            while True:
+                try:
+                    buffer.append(await asyncio.wait_for(self._log_queue.get(), timeout=1.0))
+                    while len(buffer) < 32 and not self._log_queue.empty():
+                        buffer.append(self._log_queue.get_nowait())
+                except asyncio.TimeoutError:
+                    pass
+
+                if buffer:
+                    await asyncio.to_thread(self._append_result_lines, buffer)
+                    buffer = []
+
+        except asyncio.CancelledError:
+            # Flush anything still queued before shutting down
+            while not self._log_queue.empty():
+                buffer.append(self._log_queue.get_nowait())
+            if buffer:
+                self._append_result_lines(buffer)
+            raise
+
     def _display_stats(self):
         """Display live statistics"""
+        self._refresh_stats()
         runtime = int(time.time() - self.stats['start_time'])
         hours, remainder = divmod(runtime, 3600)
         minutes, seconds = divmod(remainder, 60)
@@ -441,39 +716,88 @@ class DiscordUsernameMonitor:
                      f"{Colors.yellow}Speed: {checks_per_min:.1f}/min | "
                      f"{Colors.white}Runtime: {hours:02d}:{minutes:02d}:{seconds:02d}")
         
-        print(f"\r{' ' * 120}", end="")
-        print(f"\r{stats_line}", end="", flush=True)
+        # One write + one flush instead of two buffered print calls
+        sys.stdout.write(f"\r{' ' * 120}\r{stats_line}")
+        sys.stdout.flush()
     
+    async def _refresh_dns(self):
+        """Re-resolve discord.com and rebuild the session if the IPs moved"""
+        entries = await asyncio.to_thread(self._resolve_discord_dns)
+        if entries and entries != self._dns_entries:
+            self.logger.info("discord.com IPs changed, rebuilding HTTP session")
+            old = self._http
+            self._create_http_session()
+            if old is not None:
+                try:
+                    await old.close()
+                except Exception:
+                    pass
+
     async def _stats_updater(self):
-        """Background stats updater"""
+        """Background stats updater and display refresher
+
+        Owning the display here keeps blocking stdout writes out of the
+        workers: two refreshes per second instead of one per N checks.
+        """
+        ticks = 0
         while not self.stop_event.is_set():
             try:
-                await asyncio.sleep(30)
-                self._save_session_stats()
+                # Event.wait wakes immediately on shutdown instead of
+                # finishing out the sleep
+                try:
+                    await asyncio.wait_for(self._stop_async.wait(), timeout=0.5)
+                    return
+                except asyncio.TimeoutError:
+                    pass
+                ticks += 1
+                self._display_stats()
+                if ticks % 60 == 0:  # every ~30s
+                    await asyncio.to_thread(self._save_session_stats)
+                if ticks % 600 == 0:  # every ~300s
+                    await self._refresh_dns()
             except Exception as e:
                 self.logger.error(f"Stats updater error: {e}")
     
     def _save_session_stats(self):
-        """Save session statistics"""
-        import json
-        
+        """Save session statistics (atomic write, skipped when unchanged)"""
+        self._refresh_stats()
+
+        # Volatile fields (timestamp, runtime) are excluded from the
+        # fingerprint so an idle monitor doesn't rewrite identical stats
+        fingerprint = (
+            self.stats['checked_count'],
+            self.stats['available_found'],
+            self.stats['rate_limited_count']
+        )
+        if fingerprint == self._last_stats_fingerprint:
+            return
+        self._last_stats_fingerprint = fingerprint
+
         stats_data = {
             **self.stats,
             "runtime_seconds": int(time.time() - self.stats['start_time']),
-            "total_usernames": len(self.username_list),
+            "total_usernames": self._username_n or len(self.username_list),
             "thread_count": self.thread_count,
             "mode": self.mode,
             "timestamp": datetime.now().isoformat()
         }
-        
+
+        if orjson is not None:
+            payload = orjson.dumps(stats_data, option=orjson.OPT_INDENT_2)
+        else:
+            payload = json.dumps(stats_data, indent=2).encode()
+
         try:
-            with open("data/session_stats.json", "w") as f:
-                json.dump(stats_data, f, indent=2)
+            tmp_path = "data/session_stats.json.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, "data/session_stats.json")
         except Exception as e:
             self.logger.error(f"Failed to save stats: {e}")
     
     async def _display_final_results(self):
         """Display final session results"""
+        self._refresh_stats()
         runtime = int(time.time() - self.stats['start_time'])
         hours, remainder = divmod(runtime, 3600)
         minutes, seconds = divmod(remainder, 60)
@@ -505,9 +829,20 @@ class DiscordUsernameMonitor:
         
         if file_path:
             try:
+                # Streaming dedup: keep only 64-bit hashes of seen names so a
+                # huge wordlist is never materialized as both a list and a set
+                usernames = []
+                seen = set()
                 with open(file_path, 'r', encoding='utf-8') as f:
-                    usernames = [line.strip().lower() for line in f if line.strip()]
-                return list(set(usernames))
+                    for line in f:
+                        username = line.strip().lower()
+                        if not username:
+                            continue
+                        digest = hash(username)
+                        if digest not in seen:
+                            seen.add(digest)
+                            usernames.append(username)
+                return usernames
             except Exception as e:
                 self.logger.error(f"Failed to load username file: {e}")
         
@@ -521,28 +856,48 @@ class DiscordUsernameMonitor:
             from nltk.corpus import words
             
             word_list = words.words()
-            filtered = [w.lower() for w in word_list if 2 <= len(w) <= 12 and w.isalpha()]
+            try:
+                import numpy as np
+                arr = np.array(word_list)
+                lengths = np.char.str_len(arr)
+                mask = (lengths >= 2) & (lengths <= 12) & np.char.isalpha(arr)
+                filtered = np.char.lower(arr[mask]).tolist()
+            except ImportError:
+                filtered = [w.lower() for w in word_list if 2 <= len(w) <= 12 and w.isalpha()]
             return random.sample(filtered, min(3000, len(filtered)))
-            
+
         except ImportError:
             self.logger.warning("NLTK not available, using basic word list")
             return ['cat', 'dog', 'sun', 'moon', 'star', 'fire', 'water', 'earth']
-    
+
     async def _generate_random_usernames(self):
         """Generate random usernames"""
         import string
-        
-        count = int(Write.Input('Number of usernames (100-5000): ', Colors.blue_to_cyan, interval=0.02) or "1000")
-        length = int(Write.Input('Username length (2-12): ', Colors.blue_to_cyan, interval=0.02) or "4")
-        
-        usernames = set()
+
+        count = self._username_count
+        length = self._username_length
+
         chars = string.ascii_lowercase + string.digits
-        
+
+        try:
+            # Vectorized path: one C-level draw for all candidates instead of
+            # a Python loop of random.choices + join per username
+            import numpy as np
+            rng = np.random.default_rng()
+            lut = np.frombuffer(chars.encode(), dtype=np.uint8)
+            idx = rng.integers(0, len(chars), size=(count * 2, length), dtype=np.uint8)
+            blob = lut[idx].tobytes()
+            unique = {blob[i:i + length] for i in range(0, len(blob), length)}
+            return [u.decode() for u in list(unique)[:count]]
+        except ImportError:
+            pass
+
+        usernames = set()
         while len(usernames) < count:
             username = ''.join(random.choices(chars, k=length))
             usernames.add(username)
-            
+
             if len(usernames) > count * 2:  # Prevent infinite loop
                 break
-        
+
         return list(usernames)
\ No newline at end of file
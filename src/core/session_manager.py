@@ -3,19 +3,99 @@ Discord Username Monitor - Session Management
 Handles persistent Discord API sessions with proper authentication
 """
 
+import os
 import time
-import threading
 import base64
 import json
 import random
-import string
 from curl_cffi import requests as curl_requests
 import asyncio
-from pystyle import Colors, Colorate, Write, Center
+from pystyle import Colors
 from utils.logger import get_logger
 import traceback
 import discord
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_body(payload):
+    """Serialize a request body with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':')).encode()
+
+
+# Header fields that never vary across accounts or requests - built once
+# so _generate_headers only overlays the per-account values
+_STATIC_HEADERS = {
+    "Content-Type": "application/json",
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36",
+    "Accept": "*/*",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br, zstd",
+    "Origin": "https://discord.com",
+    "Referer": "https://discord.com/channels/@me",
+    "Sec-Ch-Ua": '"Chromium";v="136", "Google Chrome";v="136", "Not.A/Brand";v="99"',
+    "Sec-Ch-Ua-Mobile": "?0",
+    "Sec-Ch-Ua-Platform": '"Windows"',
+    "Sec-Fetch-Dest": "empty",
+    "Sec-Fetch-Mode": "cors",
+    "Sec-Fetch-Site": "same-origin",
+    "X-Discord-Locale": "en-US",
+    "X-Discord-Timezone": "America/New_York",
+    "X-Context-Properties": "e30=",  # Base64 empty JSON
+    "DNT": "1",
+    "Connection": "keep-alive"
+}
+
+
+class DiscordRateLimiter:
+    """Proactive per-bucket rate limiter fed by Discord's X-RateLimit headers
+
+    Discord reports remaining quota and reset time on every response, so
+    requests can wait out a depleted bucket up front instead of eating a
+    429 after the fact. Buckets are keyed by route template.
+    """
+
+    def __init__(self):
+        self._buckets = {}
+
+    async def acquire(self, route):
+        """Wait until the route's bucket has quota"""
+        bucket = self._buckets.get(route)
+        if bucket is None:
+            return
+
+        if bucket['remaining'] > 0:
+            bucket['remaining'] -= 1
+            return
+
+        wait = bucket['reset_at'] - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        # Optimistically allow one request; the response headers refresh
+        # the real quota
+        bucket['remaining'] = 0
+
+    def update(self, route, response):
+        """Record the bucket state reported on a response"""
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset_after = response.headers.get('X-RateLimit-Reset-After')
+        if remaining is None or reset_after is None:
+            return
+
+        try:
+            self._buckets[route] = {
+                'remaining': int(float(remaining)),
+                'reset_at': time.monotonic() + float(reset_after)
+            }
+        except ValueError:
+            pass
+
+
 class SessionManager:
     """Manages persistent Discord API sessions"""
     
@@ -23,49 +103,98 @@ class SessionManager:
         self.config = config
         self.logger = get_logger(__name__)
         
+        # All session state is touched only from the event-loop thread,
+        # so the dict needs no lock
         self.sessions = {}
-        self.session_lock = threading.Lock()
         self.fingerprint_cache = None
+
+        # Long-lived session for fingerprint fetches - keeps one warm TLS
+        # connection instead of a fresh handshake per cache miss
+        self._fp_session = None
+        self.rate_limiter = DiscordRateLimiter()
+
+        # Accounts whose discord.py gateway path has failed - their claims
+        # go straight to the session-based flow
+        self._client_disabled = set()
+
+        # Recently-observed taken usernames: probable-taken names skip the
+        # pomelo round-trip. Bounded; a stale entry just costs one wasted
+        # skip until the checker observes the name available again.
+        self.taken_usernames = set()
+        self._taken_cap = 100_000
+
+        # In-flight claims by username (see claim_username)
+        self._claim_inflight = {}
+
+        # Encode X-Super-Properties once up front - the embedded UUIDs
+        # identify this client session for its whole lifetime
+        self._super_props_cached = None
+        self._generate_super_properties()
         
     async def initialize_sessions(self, accounts, session_data):
-        """Initialize sessions for all accounts"""
+        """Initialize sessions for all accounts concurrently
+
+        Handshakes overlap under a bounded semaphore instead of running
+        one at a time, so N accounts cost roughly ceil(N/16) handshake
+        round-trips instead of N.
+        """
         self.logger.info(f"Initializing sessions for {len(accounts)} accounts")
-        
-        initialized = 0
-        failed = 0
-        
-        for account in accounts:
+
+        # Warm the fingerprint cache once up front so the concurrent
+        # session builds below don't each race to fetch /experiments
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._get_fingerprint)
+
+        sem = asyncio.Semaphore(16)
+        results = await asyncio.gather(
+            *[self._init_one(account, session_data.get(account.email, {}), sem)
+              for account in accounts],
+            return_exceptions=True
+        )
+
+        initialized = sum(1 for r in results if r is True)
+        failed = len(results) - initialized
+
+        self.logger.info(f"Sessions initialized: {initialized} success, {failed} failed")
+
+    async def _init_one(self, account, browser_data, sem):
+        """Create and register one account session under the semaphore"""
+        async with sem:
             try:
-                session = await self._create_session(account, session_data.get(account.email, {}))
-                if session:
-                    with self.session_lock:
-                        self.sessions[account.email] = {
-                            'session': session,
-                            'created': time.time(),
-                            'account': account,
-                            'failures': 0
-                        }
-                    initialized += 1
-                    self.logger.info(f"Session initialized: {account.email}")
-                else:
-                    failed += 1
+                session = await self._create_session(account, browser_data)
+                if not session:
                     self.logger.error(f"Session failed: {account.email}")
-                    
-                # Prevent rate limiting during initialization
-                await asyncio.sleep(0.3)
-                
+                    return False
+
+                self.sessions[account.email] = {
+                    'session': session,
+                    'created': time.time(),
+                    'account': account,
+                    'failures': 0
+                }
+                self.logger.info(f"Session initialized: {account.email}")
+
+                # Jittered spacing to avoid hammering discord.com with
+                # simultaneous validation requests
+                await asyncio.sleep(random.uniform(0.1, 0.3))
+                return True
+
             except Exception as e:
-                failed += 1
                 self.logger.error(f"Session error for {account.email}: {e}")
-        
-        self.logger.info(f"Sessions initialized: {initialized} success, {failed} failed")
+                return False
     
     async def _create_session(self, account, browser_data):
         """Create a persistent session for an account"""
         try:
-            session = curl_requests.Session(impersonate="chrome136")
-            
-            # Use browser data if available, otherwise generate headers
+            # AsyncSession keeps the request off the event loop - a sync
+            # Session here would stall every other coroutine for the full
+            # round-trip
+            session = curl_requests.AsyncSession(impersonate="chrome136")
+
+            # Headers are assigned exactly once here and pinned for the
+            # session's lifetime - Authorization, X-Fingerprint and
+            # X-Super-Properties are all per-session values, so nothing
+            # downstream should ever rebuild them per request
             if browser_data and browser_data.get('headers'):
                 session.headers.update(browser_data['headers'])
                 if browser_data.get('cookies'):
@@ -74,77 +203,70 @@ class SessionManager:
                 session.headers.update(self._generate_headers(account.token))
                 # Fetch initial cookies
                 try:
-                    response = session.get("https://discord.com/login", timeout=10)
+                    response = await session.get("https://discord.com/login", timeout=10)
                     # Cookies are automatically handled by the session
                 except Exception as e:
                     self.logger.warning(f"Failed to fetch initial cookies: {e}")
-            
+
             # Validate session
             if await self._validate_session(session):
                 return session
             else:
-                session.close()
+                await session.close()
                 return None
-                
+
         except Exception as e:
             self.logger.error(f"Session creation failed: {e}")
             return None
-    
+
     async def _validate_session(self, session):
         """Validate that a session is working"""
         try:
-            response = session.get("https://discord.com/api/v9/users/@me", timeout=10)
+            response = await session.get("https://discord.com/api/v9/users/@me", timeout=10)
             return response.status_code == 200
         except Exception:
             return False
     
+    def note_taken(self, username):
+        """Record a username observed as taken"""
+        if len(self.taken_usernames) >= self._taken_cap:
+            self.taken_usernames.clear()
+        self.taken_usernames.add(username)
+
+    def note_available(self, username):
+        """Clear a username that has been observed available again"""
+        self.taken_usernames.discard(username)
+
     def get_session(self, account_email):
         """Get a session for an account"""
-        with self.session_lock:
-            if account_email not in self.sessions:
-                return None
-                
-            session_data = self.sessions[account_email]
-            
-            # Check if session is too old (5 minutes)
-            if time.time() - session_data['created'] > 300:
-                try:
-                    session_data['session'].close()
-                except:
-                    pass
-                del self.sessions[account_email]
-                return None
-            
-            return session_data['session']
+        session_data = self.sessions.get(account_email)
+        if session_data is None:
+            return None
+
+        # Touch rather than tear down: closing a keep-alive session
+        # mid-claim would force a fresh ~2-3s impersonated TLS handshake.
+        # Stale sessions are evicted by cleanup_sessions instead.
+        session_data['created'] = time.time()
+        return session_data['session']
     
     def _generate_headers(self, token):
         """Generate Discord headers for a token"""
         return {
-            "Content-Type": "application/json",
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36",
-            "Accept": "*/*",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "gzip, deflate, br, zstd",
+            **_STATIC_HEADERS,
             "Authorization": token,
-            "Origin": "https://discord.com",
-            "Referer": "https://discord.com/channels/@me",
-            "Sec-Ch-Ua": '"Chromium";v="136", "Google Chrome";v="136", "Not.A/Brand";v="99"',
-            "Sec-Ch-Ua-Mobile": "?0",
-            "Sec-Ch-Ua-Platform": '"Windows"',
-            "Sec-Fetch-Dest": "empty",
-            "Sec-Fetch-Mode": "cors",
-            "Sec-Fetch-Site": "same-origin",
             "X-Super-Properties": self._generate_super_properties(),
-            "X-Discord-Locale": "en-US",
-            "X-Discord-Timezone": "America/New_York",
-            "X-Fingerprint": self._get_fingerprint(),
-            "X-Context-Properties": "e30=",  # Base64 empty JSON
-            "DNT": "1",
-            "Connection": "keep-alive"
+            "X-Fingerprint": self._get_fingerprint()
         }
-    
+
     def _generate_super_properties(self):
-        """Generate X-Super-Properties header"""
+        """Generate X-Super-Properties header (encoded once per process)
+
+        The embedded UUIDs identify one client session, not one request,
+        so the base64 payload is cached after the first call.
+        """
+        if self._super_props_cached is not None:
+            return self._super_props_cached
+
         properties = {
             "os": "Windows",
             "browser": "Chrome",
@@ -168,13 +290,13 @@ class SessionManager:
             "design_id": 0
         }
         
-        return base64.b64encode(
-            json.dumps(properties, separators=(',', ':')).encode()
-        ).decode()
+        self._super_props_cached = base64.b64encode(_json_body(properties)).decode()
+        return self._super_props_cached
     
     def _generate_uuid(self):
-        """Generate a UUID-like string"""
-        return f"{random.randint(10000000, 99999999):08x}-{random.randint(1000, 9999):04x}-{random.randint(1000, 9999):04x}-{random.randint(1000, 9999):04x}-{''.join(random.choices(string.hexdigits.lower(), k=12))}"
+        """Generate a UUID-like string from one urandom read"""
+        h = os.urandom(16).hex()
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:32]}"
     
     def _get_fingerprint(self):
         """Get Discord fingerprint"""
@@ -182,9 +304,11 @@ class SessionManager:
             return self.fingerprint_cache
             
         try:
-            session = curl_requests.Session(impersonate="chrome136")
-            response = session.get("https://discord.com/api/v9/experiments", timeout=10)
-            
+            if self._fp_session is None:
+                self._fp_session = curl_requests.Session(impersonate="chrome136")
+
+            response = self._fp_session.get("https://discord.com/api/v9/experiments", timeout=10)
+
             if response.status_code == 200:
                 self.fingerprint_cache = response.json().get("fingerprint", "")
                 return self.fingerprint_cache
@@ -194,28 +318,47 @@ class SessionManager:
             
         return ""
     
-    def cleanup_sessions(self):
+    async def cleanup_sessions(self):
         """Clean up old or invalid sessions"""
         current_time = time.time()
-        
-        with self.session_lock:
-            emails_to_remove = []
-            
-            for email, session_data in self.sessions.items():
-                # Remove sessions older than 10 minutes
-                if current_time - session_data['created'] > 600:
-                    emails_to_remove.append(email)
-            
-            for email in emails_to_remove:
-                try:
-                    self.sessions[email]['session'].close()
-                except:
-                    pass
-                del self.sessions[email]
-                self.logger.info(f"Session cleaned up: {email}")
+
+        # Remove sessions older than 10 minutes; collect first, then close
+        # so the close IO never runs while iterating the dict
+        expired = [
+            (email, session_data['session'])
+            for email, session_data in self.sessions.items()
+            if current_time - session_data['created'] > 600
+        ]
+
+        for email, session in expired:
+            del self.sessions[email]
+            try:
+                await session.close()
+            except:
+                pass
+            self.logger.info(f"Session cleaned up: {email}")
     
         # ===== NEW: AUTOMATIC CLAIM METHOD =====
     async def claim_username(self, account, username):
+        """Attempt to claim a username, coalescing concurrent attempts
+
+        If several workers spot the same name in the same cycle, only the
+        first attempt actually runs; the rest await its result instead of
+        burning duplicate pomelo/patch quota on a name that can only be
+        claimed once.
+        """
+        existing = self._claim_inflight.get(username)
+        if existing is not None:
+            return await asyncio.shield(existing)
+
+        task = asyncio.ensure_future(self._claim_username_once(account, username))
+        self._claim_inflight[username] = task
+        try:
+            return await task
+        finally:
+            self._claim_inflight.pop(username, None)
+
+    async def _claim_username_once(self, account, username):
         """
         Attempt to claim a username using discord.py client first, falling back to session-based approach
         """
@@ -232,39 +375,47 @@ class SessionManager:
             self.logger.error(f"No password in account: {email}. Cannot claim {username}")
             return False
 
-        try:
-            # Step 1: Attempt discord.py client connection
-            client = discord.Client()
+        # Skip the network round-trip for names recently seen taken
+        if username in self.taken_usernames:
+            self.logger.info(f"SKIP: {username} recently observed taken")
+            return False
 
-            async def attempt_client_connection():
-                try:
-                    await client.start(token)
-                except Exception as e:
-                    self.logger.error(f"Client start error for {email}: {e}")
-                    raise
+        try:
+            # Step 1: Attempt discord.py client connection - skipped once the
+            # gateway path has failed for this account, since the WSS +
+            # IDENTIFY handshake costs seconds per attempt
+            if email not in self._client_disabled:
+                client = discord.Client()
 
-            # Run client connection in a task
-            task = asyncio.create_task(attempt_client_connection())
+                async def attempt_client_connection():
+                    try:
+                        await client.start(token)
+                    except Exception as e:
+                        self.logger.error(f"Client start error for {email}: {e}")
+                        raise
 
-            try:
-                # Wait for the client to be ready
-                await asyncio.wait_for(client.wait_until_ready(), timeout=12)
+                # Run client connection in a task
+                task = asyncio.create_task(attempt_client_connection())
 
-                # Step 2: Attempt to claim username with discord.py
                 try:
-                    await client.user.edit(username=username, password=password)
-                    self.logger.info(f"SUCCESS: Claimed {username} with {email} via discord.py")
-                    print(f"\n{Colors.green}🎉 SUCCESS! Claimed {username} for {email} via discord.py!{Colors.white}")
-                    return True
-                except discord.errors.HTTPException as e:
-                    self.logger.error(f"Discord.py claim failed for {username} with {email}: {e}")
-                    # Continue to session-based approach
-                except Exception as e:
-                    self.logger.error(f"Unexpected error during discord.py claim for {username} with {email}: {e}")
-                    # Continue to session-based approach
-            except asyncio.TimeoutError:
-                self.logger.error(f"Timeout waiting for client ready for {email}")
-                # Continue to session-based approach
+                    # Wait for the client to be ready
+                    await asyncio.wait_for(client.wait_until_ready(), timeout=12)
+
+                    # Step 2: Attempt to claim username with discord.py
+                    try:
+                        await client.user.edit(username=username, password=password)
+                        self.logger.info(f"SUCCESS: Claimed {username} with {email} via discord.py")
+                        print(f"\n{Colors.green}🎉 SUCCESS! Claimed {username} for {email} via discord.py!{Colors.white}")
+                        return True
+                    except discord.errors.HTTPException as e:
+                        self.logger.error(f"Discord.py claim failed for {username} with {email}: {e}")
+                        # Continue to session-based approach
+                    except Exception as e:
+                        self.logger.error(f"Unexpected error during discord.py claim for {username} with {email}: {e}")
+                        self._client_disabled.add(email)
+                except asyncio.TimeoutError:
+                    self.logger.error(f"Timeout waiting for client ready for {email}")
+                    self._client_disabled.add(email)
 
             # Step 3: Fallback to session-based claim
             self.logger.info(f"FALLBACK: Attempting session-based claim for {username} with {email}")
@@ -279,14 +430,25 @@ class SessionManager:
                     self.logger.error(f"Failed to create session for {email}")
                     return False
 
+                # Register it so repeat claims for this account reuse the
+                # connection instead of handshaking again
+                self.sessions[account.email] = {
+                    'session': session,
+                    'created': time.time(),
+                    'account': account,
+                    'failures': 0
+                }
+
             # Step 4: Perform pomelo-attempt
             self.logger.info(f"CLAIM_FLOW: [{username}] Attempting pomelo check with {email}")
             pomelo_payload = {"username": username}
-            pomelo_response = session.post(
+            await self.rate_limiter.acquire("POST:/users/@me/pomelo-attempt")
+            pomelo_response = await session.post(
                 "https://discord.com/api/v9/users/@me/pomelo-attempt",
-                json=pomelo_payload,
+                data=_json_body(pomelo_payload),
                 timeout=15
             )
+            self.rate_limiter.update("POST:/users/@me/pomelo-attempt", pomelo_response)
             self.logger.info(f"POMELO_ATTEMPT: [{username}] Status: {pomelo_response.status_code}")
 
             if pomelo_response.status_code != 200:
@@ -295,16 +457,21 @@ class SessionManager:
                     retry_after = float(pomelo_response.headers.get('Retry-After', 5))
                     self.logger.info(f"RATE_LIMIT: Pomelo attempt for {username}, retry after {retry_after}s")
                     await asyncio.sleep(retry_after)
+                elif pomelo_response.status_code == 400:
+                    # The name is gone; remember so repeat claims skip it
+                    self.note_taken(username)
                 return False
 
             # Step 5: Attempt the final claim
             self.logger.info(f"CLAIM_FLOW: [{username}] Pomelo success. Proceeding to final claim.")
             claim_payload = {"username": username, "password": password}
-            claim_response = session.patch(
-                "https://discord.com/api/v9/users/@me", 
-                json=claim_payload,
+            await self.rate_limiter.acquire("PATCH:/users/@me")
+            claim_response = await session.patch(
+                "https://discord.com/api/v9/users/@me",
+                data=_json_body(claim_payload),
                 timeout=15
             )
+            self.rate_limiter.update("PATCH:/users/@me", claim_response)
 
             # Step 6: Handle potential CAPTCHA challenge
             if claim_response.status_code == 400:
@@ -330,17 +497,17 @@ class SessionManager:
                             claim_payload["captcha_key"] = captcha_solution
                             if error_data.get("captcha_rqtoken"):
                                 claim_payload["captcha_rqtoken"] = error_data.get("captcha_rqtoken")
-                            claim_response = session.patch(
+                            claim_response = await session.patch(
                                 "https://discord.com/api/v9/users/@me",
-                                json=claim_payload,
+                                data=_json_body(claim_payload),
                                 timeout=15
                             )
                             # Retry once more if still 400
                             if claim_response.status_code == 400:
                                 self.logger.info(f"RETRY: Attempting claim again for {username} due to 400 status")
-                                claim_response = session.patch(
+                                claim_response = await session.patch(
                                     "https://discord.com/api/v9/users/@me",
-                                    json=claim_payload,
+                                    data=_json_body(claim_payload),
                                     timeout=15
                                 )
                         else:
@@ -18,7 +18,14 @@ sys.path.insert(0, str(Path(__file__).parent))
 from core.monitor import DiscordUsernameMonitor
 from utils.logger import setup_logging
 from utils.config_manager import ConfigManager
-from pystyle import Colors, Write
+from pystyle import Colors
+
+# uvloop gives 2-4x event-loop throughput; unavailable on Windows
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
 
 
 def display_banner():
@@ -64,7 +71,10 @@ def main():
         
         # Create and run monitor
         monitor = DiscordUsernameMonitor(config)
-        
+
+        # Collect all interactive settings before the event loop starts
+        monitor.prompt_configuration()
+
         # Run the monitoring system
         asyncio.run(monitor.start())
         
@@ -3,11 +3,50 @@ Discord Username Monitor - Account Data Model
 Represents a Discord account with credentials
 """
 
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from typing import Optional
 
+# Slotted dataclasses (3.10+) skip the per-instance __dict__, cutting
+# memory and speeding attribute access for bulk-loaded accounts
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+class AccountBatch:
+    """Columnar (struct-of-arrays) view over a parsed account list
+
+    Hot loops that scan a single field (tokens for validation, emails
+    for display) walk one contiguous column instead of hopping across
+    per-account object headers. Columns are NumPy object arrays when
+    NumPy is available - boolean-mask filtering then stays vectorized -
+    and plain lists otherwise.
+    """
+
+    def __init__(self, accounts):
+        self._accounts = list(accounts)
+
+        try:
+            import numpy as np
+            as_column = lambda values: np.array(values, dtype=object)
+        except ImportError:
+            as_column = list
+
+        self.emails = as_column([a.email for a in self._accounts])
+        self.tokens = as_column([a.token for a in self._accounts])
+        self.passwords = as_column([a.password for a in self._accounts])
+        self.usernames = as_column([a.username for a in self._accounts])
+        self.formats = as_column([a.format for a in self._accounts])
+        self.line_nums = as_column([a.line_num for a in self._accounts])
+
+    def __len__(self):
+        return len(self._accounts)
+
+    def to_list(self):
+        """The original Account objects, for callers that need the object API"""
+        return self._accounts
+
+
+@dataclass(**_SLOTS)
 class Account:
     """Discord account data model"""
     
@@ -17,6 +56,12 @@ class Account:
     username: Optional[str] = None
     format: str = "unknown"
     line_num: Optional[int] = None
+
+    # Lazily computed display/serialization caches (slots-compatible,
+    # unlike functools.cached_property)
+    _masked_token: Optional[str] = field(default=None, init=False, repr=False)
+    _credentials_string: Optional[str] = field(default=None, init=False, repr=False)
+    _creds_field: Optional[str] = field(default=None, init=False, repr=False)
     
     def __post_init__(self):
         """Validate account data after initialization"""
@@ -43,11 +88,24 @@ class Account:
     
     @property
     def masked_token(self):
-        """Get masked token for display"""
-        if len(self.token) > 20:
-            return f"{self.token[:10]}...{self.token[-10:]}"
-        return f"{self.token[:5]}..."
+        """Get masked token for display (computed once per account)"""
+        if self._masked_token is None:
+            if len(self.token) > 20:
+                self._masked_token = f"{self.token[:10]}...{self.token[-10:]}"
+            else:
+                self._masked_token = f"{self.token[:5]}..."
+        return self._masked_token
     
+    @property
+    def credentials_field(self):
+        """Webhook embed credentials block (computed once per account)"""
+        if self._creds_field is None:
+            self._creds_field = (
+                f"```\nEmail: {self.email}\nPassword: {self.password or 'N/A'}\n"
+                f"Token: {self.token[:20]}...\n```"
+            )
+        return self._creds_field
+
     @property
     def has_password(self):
         """Check if account has password"""
@@ -59,8 +117,10 @@ class Account:
         return self.has_password
     
     def to_credentials_string(self):
-        """Convert to credentials string format"""
-        return f"{self.email}:{self.password or 'N/A'}:{self.token}"
+        """Convert to credentials string format (cached after first build)"""
+        if self._credentials_string is None:
+            self._credentials_string = f"{self.email}:{self.password or 'N/A'}:{self.token}"
+        return self._credentials_string
     
     def to_dict(self):
         """Convert to dictionary"""
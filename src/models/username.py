@@ -3,21 +3,112 @@ Discord Username Monitor - Username Data Model
 Represents a username being monitored
 """
 
+import string
+import sys
+import time
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
+# Discord allows letters, numbers, periods, underscores
+_ALLOWED_CHARS = frozenset(string.ascii_letters + string.digits + '._')
 
-@dataclass
+# Slotted dataclasses (3.10+) skip the per-instance __dict__ - monitors
+# hold thousands of these
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+# Status codes for the columnar table below
+STATUS_UNKNOWN, STATUS_AVAILABLE, STATUS_TAKEN, STATUS_CHECKING, STATUS_CLAIMED = range(5)
+
+_STATUS_NAMES = ("unknown", "available", "taken", "checking", "claimed")
+
+
+class UsernameTable:
+    """Columnar (struct-of-arrays) storage for large username sets
+
+    Instead of one Username object per name, state lives in parallel
+    columns indexed by position - roughly 10x denser in memory, and bulk
+    filters become single vector operations when NumPy is available.
+    Falls back to stdlib array columns otherwise.
+    """
+
+    def __init__(self, names):
+        self.names = list(names)
+        n = self._n = len(self.names)
+
+        try:
+            import numpy as np
+            self._np = np
+            self.lengths = np.fromiter((len(name) for name in self.names), dtype=np.uint8, count=n)
+            self.status = np.zeros(n, dtype=np.uint8)
+            self.check_count = np.zeros(n, dtype=np.uint32)
+            self.last_checked = np.zeros(n, dtype=np.float64)
+            self.found_at = np.zeros(n, dtype=np.float64)
+        except ImportError:
+            import array
+            self._np = None
+            self.lengths = array.array('B', (len(name) for name in self.names))
+            self.status = array.array('B', bytes(n))
+            self.check_count = array.array('L', [0]) * n
+            self.last_checked = array.array('d', [0.0]) * n
+            self.found_at = array.array('d', [0.0]) * n
+
+    def __len__(self):
+        return self._n
+
+    def release_names(self):
+        """Drop the name column when the caller stores names elsewhere
+
+        Blob-backed monitors keep names in one contiguous buffer; the
+        status columns stay index-aligned with it, so holding a second
+        str list here would forfeit the blob's memory win.
+        """
+        self.names = []
+
+    def mark_checking(self, idx):
+        """Mark a username as being checked"""
+        self.status[idx] = STATUS_CHECKING
+        self.check_count[idx] += 1
+
+    def mark_taken(self, idx):
+        """Mark a username as taken"""
+        self.status[idx] = STATUS_TAKEN
+        self.last_checked[idx] = time.time()
+
+    def mark_available(self, idx):
+        """Mark a username as available"""
+        self.status[idx] = STATUS_AVAILABLE
+        self.found_at[idx] = time.time()
+
+    def available_indices(self):
+        """Indices currently marked available (vectorized under NumPy)"""
+        if self._np is not None:
+            return self._np.flatnonzero(self.status == STATUS_AVAILABLE).tolist()
+        return [i for i, s in enumerate(self.status) if s == STATUS_AVAILABLE]
+
+    def __getitem__(self, idx):
+        """Materialize a Username view for callers that need the object API"""
+        return Username(
+            name=self.names[idx],
+            length=int(self.lengths[idx]),
+            status=_STATUS_NAMES[self.status[idx]],
+            last_checked=float(self.last_checked[idx]) or None,
+            check_count=int(self.check_count[idx]),
+            found_at=float(self.found_at[idx]) or None
+        )
+
+
+@dataclass(**_SLOTS)
 class Username:
     """Username data model for monitoring"""
     
     name: str
     length: int
     status: str = "unknown"  # unknown, available, taken, checking
-    last_checked: Optional[datetime] = None
+    last_checked: Optional[float] = None  # epoch seconds
     check_count: int = 0
-    found_at: Optional[datetime] = None
+    found_at: Optional[float] = None  # epoch seconds
     claimed_by: Optional[str] = None
     
     def __post_init__(self):
@@ -40,15 +131,22 @@ class Username:
         self.length = len(self.name)
     
     def _is_valid_username(self, username):
-        """Check if username contains valid Discord characters"""
-        import re
-        # Discord allows letters, numbers, periods, underscores
-        # Cannot start/end with periods, no consecutive periods
-        if username.startswith('.') or username.endswith('.'):
-            return False
-        if '..' in username:
+        """Check if username contains valid Discord characters
+
+        One traversal covers the character set, the no-leading/trailing
+        period rule, and the no-consecutive-periods rule.
+        """
+        if not username or username[0] == '.' or username[-1] == '.':
             return False
-        return re.match(r'^[a-zA-Z0-9._]+$', username) is not None
+
+        prev = ''
+        for char in username:
+            if char not in _ALLOWED_CHARS:
+                return False
+            if char == '.' and prev == '.':
+                return False
+            prev = char
+        return True
     
     @property
     def rarity(self):
@@ -76,12 +174,12 @@ class Username:
     def mark_available(self):
         """Mark username as available"""
         self.status = "available"
-        self.found_at = datetime.now()
-    
+        self.found_at = time.time()
+
     def mark_taken(self):
         """Mark username as taken"""
         self.status = "taken"
-        self.last_checked = datetime.now()
+        self.last_checked = time.time()
     
     def mark_checking(self):
         """Mark username as being checked"""
@@ -92,7 +190,7 @@ class Username:
         """Mark username as claimed"""
         self.status = "claimed"
         self.claimed_by = account_email
-        self.found_at = datetime.now()
+        self.found_at = time.time()
     
     def to_dict(self):
         """Convert to dictionary"""
@@ -102,8 +200,8 @@ class Username:
             'status': self.status,
             'rarity': self.rarity,
             'check_count': self.check_count,
-            'last_checked': self.last_checked.isoformat() if self.last_checked else None,
-            'found_at': self.found_at.isoformat() if self.found_at else None,
+            'last_checked': datetime.fromtimestamp(self.last_checked).isoformat() if self.last_checked else None,
+            'found_at': datetime.fromtimestamp(self.found_at).isoformat() if self.found_at else None,
             'claimed_by': self.claimed_by
         }
     
@@ -5,13 +5,190 @@ Handles loading and parsing of account data in various formats
 
 import os
 import asyncio
+import hashlib
+import json
+import re
+import sys
+import time
+from collections import OrderedDict
 from pathlib import Path
-import easygui
-from pystyle import Colors, Write
+from pystyle import Colors
 from curl_cffi import requests as curl_requests
 
+from utils.io import prompt
 from utils.logger import get_logger
-from models.account import Account
+from models.account import Account, AccountBatch
+
+# A token-only line is recognized without the length/character checks
+# re-scanning it
+_TOKEN_RE = re.compile(r'^[\w.\-]{50,}$')
+
+# Real Discord tokens are three base64url segments; anything else can
+# be rejected locally without spending an HTTPS request on it
+_TOKEN_SHAPE = re.compile(r'^(mfa\.[A-Za-z0-9_\-]{20,}|[A-Za-z0-9_\-]{20,}\.[A-Za-z0-9_\-]{6,}\.[A-Za-z0-9_\-]{20,})$')
+
+# Static validation headers built once; only Authorization varies per call
+_HEADERS_TEMPLATE = {
+    "Authorization": "",
+    "Content-Type": "application/json",
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36"
+}
+
+
+def _parse_two(parts, line_num):
+    """email:token or username:token"""
+    email, token = parts
+    if '@' in email:
+        return Account(
+            email=email,
+            password=None,
+            token=token,
+            format='email:token',
+            line_num=line_num
+        )
+    # Treat as username:token
+    return Account(
+        email=f'{email}@username.local',
+        username=email,
+        password=None,
+        token=token,
+        format='username:token',
+        line_num=line_num
+    )
+
+
+def _parse_three(parts, line_num):
+    """email:password:token"""
+    email, password, token = parts
+    return Account(
+        email=email,
+        password=password,
+        token=token,
+        format='email:password:token',
+        line_num=line_num
+    )
+
+
+def _parse_four(parts, line_num):
+    """username:email:password:token"""
+    username, email, password, token = parts
+    return Account(
+        username=username,
+        email=email,
+        password=password,
+        token=token,
+        format='username:email:password:token',
+        line_num=line_num
+    )
+
+
+# Dispatch-by-part-count table used by _parse_account_line
+_LINE_HANDLERS = {2: _parse_two, 3: _parse_three, 4: _parse_four}
+
+
+class TokenValidationCache:
+    """Disk-backed LRU of recent token validation results
+
+    Back-to-back runs were re-hitting /users/@me for every token even
+    when the previous run validated it seconds earlier. Results are
+    keyed by a blake2b hash (raw tokens never touch disk) and expire
+    after an hour, so only genuinely unknown tokens cost a request.
+    """
+
+    TTL = 3600  # seconds
+    CAPACITY = 4096
+
+    def __init__(self, path="cache/token_validation.json"):
+        self.path = Path(path)
+        self._entries = OrderedDict()
+        self._load()
+
+    @staticmethod
+    def _key(token):
+        return hashlib.blake2b(token.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return
+        cutoff = time.time() - self.TTL
+        for key, entry in data.items():
+            if isinstance(entry, list) and len(entry) == 2 and entry[1] >= cutoff:
+                self._entries[key] = (bool(entry[0]), entry[1])
+
+    def get(self, token):
+        """Cached validity for a token, or None on miss/expiry"""
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        valid, stamp = entry
+        if stamp < time.time() - self.TTL:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return valid
+
+    def put(self, token, valid):
+        """Record a validation result, evicting the oldest past capacity"""
+        self._entries[self._key(token)] = (valid, time.time())
+        self._entries.move_to_end(self._key(token))
+        while len(self._entries) > self.CAPACITY:
+            self._entries.popitem(last=False)
+
+    def save(self):
+        """Persist the cache (atomic replace; failures are non-fatal)"""
+        try:
+            self.path.parent.mkdir(exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            tmp_path.write_text(
+                json.dumps({k: list(v) for k, v in self._entries.items()}),
+                encoding='utf-8'
+            )
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+
+class CreditSemaphore:
+    """Token-bucket gate for the validation fan-out
+
+    A fixed Semaphore(5) caps throughput below what Discord actually
+    permits and keeps hammering after a 429. Here each call spends one
+    credit, credits refill continuously, and a rate limit drains the
+    bucket for the whole Retry-After window so every in-flight caller
+    backs off together.
+    """
+
+    def __init__(self, capacity=50, refill_period=1.0):
+        self.capacity = capacity
+        self._credits = float(capacity)
+        self._rate = capacity / refill_period  # credits per second
+        self._updated = time.monotonic()
+        self._frozen_until = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._credits = min(self.capacity, self._credits + (now - self._updated) * self._rate)
+        self._updated = now
+        return now
+
+    async def acquire(self, credits=1.0):
+        """Wait until the bucket holds enough credits, then spend them"""
+        while True:
+            now = self._refill()
+            if now >= self._frozen_until and self._credits >= credits:
+                self._credits -= credits
+                return
+            wait = max(self._frozen_until - now, (credits - self._credits) / self._rate, 0.05)
+            await asyncio.sleep(wait)
+
+    def freeze(self, duration):
+        """Drain the bucket for `duration` seconds (called on 429)"""
+        self._credits = 0.0
+        self._updated = time.monotonic()
+        self._frozen_until = max(self._frozen_until, self._updated + duration)
 
 
 class AccountParser:
@@ -19,10 +196,15 @@ class AccountParser:
     
     def __init__(self):
         self.logger = get_logger(__name__)
-        
+        self.batch = None  # columnar view of the last loaded accounts
+
     async def load_accounts(self):
         """Load accounts from file with interactive selection"""
         print(f"\n{Colors.cyan}━━━ Account Configuration ━━━{Colors.white}")
+
+        # Deferred: easygui drags in tkinter, which is only needed for
+        # this file-pick dialog
+        import easygui
         
         # Ask for token file
         token_file = easygui.fileopenbox(
@@ -50,156 +232,254 @@ class AccountParser:
             print(f"{Colors.red}No valid accounts loaded{Colors.white}")
             return []
         
+        # SoA view for consumers that scan a single column (tokens,
+        # emails) rather than whole Account objects
+        self.batch = AccountBatch(accounts)
+
         # Ask about token validation
-        validate_tokens = Write.Input(
-            f'Validate tokens before use? (recommended) (y/n): ',
-            Colors.blue_to_cyan, interval=0.02
-        ).lower() == 'y'
-        
+        validate_tokens = prompt('Validate tokens before use? (recommended) (y/n): ').lower() == 'y'
+
         if validate_tokens:
-            accounts = await self._validate_accounts(accounts)
-        
+            accounts = await self._validate_accounts(self.batch)
+            self.batch = AccountBatch(accounts)
+
         print(f"{Colors.green}✓ Loaded {len(accounts)} accounts{Colors.white}")
         return accounts
     
     async def _parse_account_file(self, file_path):
         """Parse account file and return Account objects"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.read().splitlines()
-            
+            # Stream the file instead of materializing it: a 64 KB
+            # buffered reader keeps RSS bounded on huge token dumps and
+            # lets the shape pass run while the OS prefetches ahead.
+            # Single pass over the raw bytes: drop empties/comments and
+            # bucket lines by shape (separator, part count) so each
+            # bucket runs one tight constructor path instead of
+            # re-sniffing the separator for every line
+            buckets = {}
+            with open(file_path, 'rb', buffering=65536) as f:
+                for line_num, raw in enumerate(f, 1):
+                    raw = raw.strip()
+                    if not raw or raw.startswith(b'#'):
+                        continue
+                    sep = b':' if b':' in raw else b'|' if b'|' in raw else None
+                    shape = (sep, raw.count(sep) + 1) if sep else (None, 1)
+                    buckets.setdefault(shape, []).append((line_num, raw))
+
             accounts = []
             supported_formats = set()
-            
-            for line_num, line in enumerate(lines, 1):
-                line = line.strip()
-                
-                # Skip empty lines and comments
-                if not line or line.startswith('#'):
-                    continue
-                
+
+            for (sep, nparts), rows in buckets.items():
                 try:
-                    account = self._parse_account_line(line, line_num)
-                    if account:
-                        accounts.append(account)
-                        supported_formats.add(account.format)
-                        
-                except Exception as e:
-                    self.logger.warning(f"Line {line_num} parsing error: {e}")
-                    print(f"{Colors.yellow}⚠️  Line {line_num}: {e}{Colors.white}")
+                    batch = self._build_account_batch(rows, sep, nparts)
+                except Exception:
+                    # Mixed-quality batch - retry line by line so good
+                    # lines survive and bad ones report their number
+                    batch = []
+                    for line_num, raw in rows:
+                        try:
+                            account = self._parse_account_line(
+                                raw.decode('utf-8', 'replace'), line_num
+                            )
+                            if account:
+                                batch.append(account)
+                        except Exception as e:
+                            self.logger.warning(f"Line {line_num} parsing error: {e}")
+                            print(f"{Colors.yellow}⚠️  Line {line_num}: {e}{Colors.white}")
+
+                accounts.extend(batch)
+                supported_formats.update(account.format for account in batch)
+
+            # Drop duplicate tokens so validation costs one request per
+            # unique token, not one per line
+            seen_tokens = set()
+            deduped = []
+            for account in accounts:
+                if account.token in seen_tokens:
                     continue
-            
+                seen_tokens.add(account.token)
+                deduped.append(account)
+
+            if len(deduped) != len(accounts):
+                self.logger.info(f"Skipped {len(accounts) - len(deduped)} duplicate tokens")
+                accounts = deduped
+
             print(f"Parsed {len(accounts)} accounts in {len(supported_formats)} formats")
             if supported_formats:
                 print(f"Detected formats: {', '.join(supported_formats)}")
-            
+
             return accounts
-            
+
         except Exception as e:
             self.logger.error(f"Failed to parse account file: {e}")
             print(f"{Colors.red}Error parsing account file: {e}{Colors.white}")
             return []
-    
-    def _parse_account_line(self, line, line_num):
-        """Parse a single account line"""
-        # Determine separator
-        separator = ':' if ':' in line else '|' if '|' in line else None
-        
-        if not separator:
-            # Check if it's a token-only line
-            if len(line) > 50 and '.' in line:
-                return Account(
+
+    def _build_account_batch(self, rows, sep, nparts):
+        """Build Accounts for a same-shape batch of (line_num, bytes) rows
+
+        Decoding happens once per line and the Account constructor is the
+        only per-row Python call; any bad line aborts the batch so the
+        caller can fall back to per-line parsing with error reporting.
+        """
+        if nparts == 1:
+            return [
+                Account(
                     email=f'user_{line_num}@token.local',
                     password=None,
-                    token=line,
+                    token=raw.decode('utf-8'),
                     format='token_only',
                     line_num=line_num
                 )
-            else:
-                raise ValueError("Invalid format - not a valid token")
-        
-        parts = [part.strip() for part in line.split(separator)]
-        
-        if len(parts) == 2:
-            # email:token or username:token
-            email, token = parts
-            
-            # Basic email validation
-            if '@' in email:
-                return Account(
-                    email=email,
+                for line_num, raw in rows
+            ]
+
+        split_rows = [
+            (line_num, [part.strip().decode('utf-8') for part in raw.split(sep)])
+            for line_num, raw in rows
+        ]
+
+        if nparts == 2:
+            return [
+                Account(
+                    email=parts[0],
                     password=None,
-                    token=token,
+                    token=parts[1],
                     format='email:token',
                     line_num=line_num
                 )
-            else:
-                # Treat as username:token
-                return Account(
-                    email=f'{email}@username.local',
-                    username=email,
+                if '@' in parts[0] else
+                Account(
+                    email=f'{parts[0]}@username.local',
+                    username=parts[0],
                     password=None,
-                    token=token,
+                    token=parts[1],
                     format='username:token',
                     line_num=line_num
                 )
-                
-        elif len(parts) == 3:
-            # email:password:token
-            email, password, token = parts
-            return Account(
-                email=email,
-                password=password,
-                token=token,
-                format='email:password:token',
-                line_num=line_num
-            )
-            
-        elif len(parts) == 4:
-            # username:email:password:token
-            username, email, password, token = parts
-            return Account(
-                username=username,
-                email=email,
-                password=password,
-                token=token,
-                format='username:email:password:token',
-                line_num=line_num
-            )
-            
-        else:
+                for line_num, parts in split_rows
+            ]
+
+        elif nparts == 3:
+            return [
+                Account(
+                    email=parts[0],
+                    password=parts[1],
+                    token=parts[2],
+                    format='email:password:token',
+                    line_num=line_num
+                )
+                for line_num, parts in split_rows
+            ]
+
+        elif nparts == 4:
+            return [
+                Account(
+                    username=parts[0],
+                    email=parts[1],
+                    password=parts[2],
+                    token=parts[3],
+                    format='username:email:password:token',
+                    line_num=line_num
+                )
+                for line_num, parts in split_rows
+            ]
+
+        raise ValueError(f"Unsupported format - expected 2-4 parts, got {nparts}")
+    
+    def _parse_account_line(self, line, line_num):
+        """Parse a single account line"""
+        # Detect the line's separator and split on it alone, mirroring
+        # _build_account_batch: mixing both separators in one class would
+        # garble passwords containing the other character, and a capped
+        # split would silently fold extra fields into the token
+        sep = ':' if ':' in line else '|' if '|' in line else None
+        parts = [part.strip() for part in line.split(sep)] if sep else [line.strip()]
+
+        if len(parts) == 1:
+            # Token-only line
+            if _TOKEN_RE.match(line) and '.' in line:
+                return Account(
+                    email=f'user_{line_num}@token.local',
+                    password=None,
+                    token=line,
+                    format='token_only',
+                    line_num=line_num
+                )
+            else:
+                raise ValueError("Invalid format - not a valid token")
+
+        # Single hash lookup replaces the len() comparison cascade
+        handler = _LINE_HANDLERS.get(len(parts))
+        if handler is None:
             raise ValueError(f"Unsupported format - expected 2-4 parts, got {len(parts)}")
+        return handler(parts, line_num)
     
-    async def _validate_accounts(self, accounts):
-        """Validate account tokens"""
+    async def _validate_accounts(self, batch):
+        """Validate the tokens of an AccountBatch"""
+        accounts = batch.to_list()
         print(f"\n{Colors.cyan}Validating {len(accounts)} account tokens...{Colors.white}")
-        
+
         valid_accounts = []
         invalid_count = 0
-        
-        # Create semaphore to limit concurrent validations
-        semaphore = asyncio.Semaphore(5)  # Max 5 concurrent validations
-        
-        async def validate_account(account):
-            async with semaphore:
-                try:
-                    is_valid = await self._validate_token(account.token)
-                    
-                    if is_valid:
-                        print(f"{Colors.green}✓ Valid: {account.email}{Colors.white}")
-                        return account
-                    else:
-                        print(f"{Colors.red}✗ Invalid: {account.email}{Colors.white}")
-                        return None
-                        
-                except Exception as e:
-                    self.logger.error(f"Validation error for {account.email}: {e}")
-                    print(f"{Colors.red}✗ Error: {account.email} - {e}{Colors.white}")
-                    return None
-        
-        # Run validations concurrently
-        tasks = [validate_account(account) for account in accounts]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Credit bucket instead of a fixed concurrency cap - throughput
+        # tracks Discord's real budget and a 429 freezes everyone
+        semaphore = CreditSemaphore(capacity=50, refill_period=1.0)
+        cache = TokenValidationCache()
+
+        # One in-place progress line instead of a print per token -
+        # per-account console flushes dominate on large lists
+        total = len(accounts)
+        done = 0
+
+        def note_progress():
+            nonlocal done
+            done += 1
+            if done % 50 == 0 or done == total:
+                sys.stdout.write(f"\r  Validated {done}/{total} tokens")
+                sys.stdout.flush()
+
+        # Cache preflight sweeps the contiguous token column - accounts
+        # with a recent verdict are settled without touching the network
+        # or building a task
+        verdicts = [cache.get(token) for token in batch.tokens]
+        pending = []
+        for account, verdict in zip(accounts, verdicts):
+            if verdict is None:
+                pending.append(account)
+                continue
+            self.logger.debug(f"Cached {'valid' if verdict else 'invalid'}: {account.email}")
+            if verdict:
+                valid_accounts.append(account)
+            else:
+                invalid_count += 1
+            note_progress()
+
+        async def validate_account(account, session):
+            await semaphore.acquire()
+            try:
+                is_valid = await self._validate_token(account.token, session, semaphore)
+                cache.put(account.token, is_valid)
+                self.logger.debug(f"{'Valid' if is_valid else 'Invalid'}: {account.email}")
+                return account if is_valid else None
+
+            except Exception as e:
+                self.logger.error(f"Validation error for {account.email}: {e}")
+                return None
+            finally:
+                note_progress()
+
+        # Run validations concurrently over one pooled session - every
+        # account shares the same TLS/connection state instead of paying
+        # a fresh handshake per token
+        results = []
+        if pending:
+            async with curl_requests.AsyncSession(impersonate="chrome136", max_clients=5) as session:
+                tasks = [validate_account(account, session) for account in pending]
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        cache.save()
         
         # Filter valid results
         for result in results:
@@ -214,32 +494,35 @@ class AccountParser:
         
         return valid_accounts
     
-    async def _validate_token(self, token):
-        """Validate a single Discord token"""
+    async def _validate_token(self, token, session, semaphore=None):
+        """Validate a single Discord token on the shared async session"""
+        # Shape preflight: tokens that can't possibly be valid fail
+        # locally instead of costing a request
+        if not _TOKEN_SHAPE.match(token):
+            self.logger.debug(f"Token failed shape preflight: {token[:12]}...")
+            return False
+
         try:
-            session = curl_requests.Session(impersonate="chrome136")
-            
-            headers = {
-                "Authorization": token,
-                "Content-Type": "application/json",
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36"
-            }
-            
-            response = session.get(
+            headers = _HEADERS_TEMPLATE.copy()
+            headers["Authorization"] = token
+
+            response = await session.get(
                 "https://discord.com/api/v9/users/@me",
                 headers=headers,
                 timeout=10
             )
-            
+
             if response.status_code == 200:
                 return True
             elif response.status_code == 429:
-                # Rate limited - wait and retry once
-                retry_after = float(response.headers.get('Retry-After', 5))
-                await asyncio.sleep(min(retry_after, 10))  # Cap at 10 seconds
-                
+                # Rate limited - freeze the whole fan-out, then retry once
+                retry_after = min(float(response.headers.get('Retry-After', 5)), 10)
+                if semaphore is not None:
+                    semaphore.freeze(retry_after)
+                await asyncio.sleep(retry_after)
+
                 # Retry once
-                response = session.get(
+                response = await session.get(
                     "https://discord.com/api/v9/users/@me",
                     headers=headers,
                     timeout=10
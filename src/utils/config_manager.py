@@ -3,12 +3,69 @@ Discord Username Monitor - Configuration Management
 Handles loading and validation of configuration settings
 """
 
+import hashlib
 import json
 import os
 from pathlib import Path
 from typing import Dict, Any
 from utils.logger import get_logger
-from pystyle import Colors, Write
+from pystyle import Colors
+
+try:
+    import orjson  # C-level JSON codec; stdlib json is the fallback
+except ImportError:
+    orjson = None
+
+
+def _json_loads(data: bytes) -> Dict[str, Any]:
+    """Parse JSON bytes with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Dict[str, Any]) -> bytes:
+    """Serialize to indented JSON bytes with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+
+# Declarative validation rules: (section, key, type, predicate, default).
+# One loop applies them all; rules that depend on another field or need
+# more than a type+range check live in the tail of _validate_config.
+_ANY = lambda value: True
+
+_SCHEMA = (
+    ('monitoring', 'default_thread_count', int, lambda v: v >= 1, 12),
+    ('monitoring', 'delay_min', (int, float), lambda v: v >= 0, 0.2),
+    ('monitoring', 'session_timeout', int, lambda v: v >= 60, 300),
+    ('monitoring', 'max_retries', int, lambda v: v >= 0, 3),
+    ('monitoring', 'rate_limit_backoff', (int, float), lambda v: v >= 0, 1.5),
+    ('browser', 'headless', bool, _ANY, False),
+    ('browser', 'session_reuse_time', int, lambda v: v >= 300, 3600),
+    ('browser', 'login_wait_time', int, lambda v: v >= 5, 15),
+    ('captcha', 'timeout', int, lambda v: v >= 30, 120),
+    ('captcha', 'enabled', bool, _ANY, False),
+    ('webhooks', 'test_on_startup', bool, _ANY, True),
+    ('webhooks', 'periodic_stats', bool, _ANY, True),
+    ('webhooks', 'stats_interval', int, lambda v: v >= 60, 1800),
+    ('proxy', 'enabled', bool, _ANY, False),
+    ('proxy', 'rotation_enabled', bool, _ANY, True),
+    ('proxy', 'timeout', int, lambda v: v >= 5, 15),
+    ('proxy', 'retry_failed', bool, _ANY, False),
+    ('logging', 'backup_count', int, lambda v: v >= 1, 5),
+)
+
+
+def _config_digest(obj: Dict[str, Any]) -> bytes:
+    """Key-order-independent fingerprint of a config dict"""
+    if orjson is not None:
+        payload = orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    else:
+        payload = json.dumps(obj, sort_keys=True).encode('utf-8')
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
 
 class ConfigManager:
     """Manages configuration loading and validation"""
@@ -29,8 +86,8 @@ class ConfigManager:
                 self._create_default_config()
                 
             # Load configuration
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                self.config = json.load(f)
+            with open(self.config_path, 'rb') as f:
+                self.config = _json_loads(f.read())
                 
             # Validate configuration
             self._validate_config()
@@ -49,14 +106,14 @@ class ConfigManager:
         """Create default configuration file from example"""
         try:
             if self.default_config_path.exists():
-                with open(self.default_config_path, 'r', encoding='utf-8') as default_f:
-                    default_config = json.load(default_f)
-                
+                with open(self.default_config_path, 'rb') as default_f:
+                    default_config = _json_loads(default_f.read())
+
                 # Ensure config directory exists
                 self.config_path.parent.mkdir(exist_ok=True)
-                
-                with open(self.config_path, 'w', encoding='utf-8') as config_f:
-                    json.dump(default_config, config_f, indent=2)
+
+                with open(self.config_path, 'wb') as config_f:
+                    config_f.write(_json_dumps(default_config))
                     
                 self.logger.info(f"Created default configuration at {self.config_path}")
                 print(f"{Colors.green}✓ Created default configuration{Colors.white}")
@@ -71,6 +128,8 @@ class ConfigManager:
     
     def _validate_config(self):
         """Validate configuration structure and values"""
+        pre_digest = _config_digest(self.config)
+
         required_sections = [
             'monitoring',
             'browser',
@@ -84,80 +143,54 @@ class ConfigManager:
         for section in required_sections:
             if section not in self.config:
                 raise ValueError(f"Missing required configuration section: {section}")
-        
-        # Validate monitoring settings
+
+        # Apply the type/range rules in one pass over the schema table
+        for section, key, typ, pred, default in _SCHEMA:
+            values = self.config[section]
+            value = values.get(key)
+            if not isinstance(value, typ) or not pred(value):
+                values[key] = default
+
+        # Cross-field and shape rules that don't fit the table
         monitoring = self.config['monitoring']
-        if not isinstance(monitoring.get('default_thread_count'), int) or monitoring['default_thread_count'] < 1:
-            monitoring['default_thread_count'] = 12
-        if not isinstance(monitoring.get('delay_min'), (int, float)) or monitoring['delay_min'] < 0:
-            monitoring['delay_min'] = 0.2
         if not isinstance(monitoring.get('delay_max'), (int, float)) or monitoring['delay_max'] < monitoring['delay_min']:
             monitoring['delay_max'] = 1.5
-        if not isinstance(monitoring.get('session_timeout'), int) or monitoring['session_timeout'] < 60:
-            monitoring['session_timeout'] = 300
-        if not isinstance(monitoring.get('max_retries'), int) or monitoring['max_retries'] < 0:
-            monitoring['max_retries'] = 3
-        if not isinstance(monitoring.get('rate_limit_backoff'), (int, float)) or monitoring['rate_limit_backoff'] < 0:
-            monitoring['rate_limit_backoff'] = 1.5
-            
-        # Validate browser settings
+
         browser = self.config['browser']
-        if not isinstance(browser.get('headless'), bool):
-            browser['headless'] = False
+        # "never" skips Selenium entirely (fast, but no Cloudflare cookies);
+        # "fallback_only" generates headers for accounts the browser fails on
+        if browser.get('mode') not in ('always', 'fallback_only', 'never'):
+            browser['mode'] = 'always'
         if not browser.get('user_agent'):
             browser['user_agent'] = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36"
-        if not isinstance(browser.get('session_reuse_time'), int) or browser['session_reuse_time'] < 300:
-            browser['session_reuse_time'] = 3600
-        if not isinstance(browser.get('login_wait_time'), int) or browser['login_wait_time'] < 5:
-            browser['login_wait_time'] = 15
-            
-        # Validate captcha settings
-        captcha = self.config['captcha']
-        if not captcha.get('service_url'):
-            captcha['service_url'] = "https://freecaptchabypass.com"
-        if not isinstance(captcha.get('timeout'), int) or captcha['timeout'] < 30:
-            captcha['timeout'] = 120
-        if not isinstance(captcha.get('enabled'), bool):
-            captcha['enabled'] = False
-            
-        # Validate webhook settings
-        webhooks = self.config['webhooks']
-        if not isinstance(webhooks.get('test_on_startup'), bool):
-            webhooks['test_on_startup'] = True
-        if not isinstance(webhooks.get('periodic_stats'), bool):
-            webhooks['periodic_stats'] = True
-        if not isinstance(webhooks.get('stats_interval'), int) or webhooks['stats_interval'] < 60:
-            webhooks['stats_interval'] = 1800
-            
-        # Validate proxy settings
-        proxy = self.config['proxy']
-        if not isinstance(proxy.get('enabled'), bool):
-            proxy['enabled'] = False
-        if not isinstance(proxy.get('rotation_enabled'), bool):
-            proxy['rotation_enabled'] = True
-        if not isinstance(proxy.get('timeout'), int) or proxy['timeout'] < 5:
-            proxy['timeout'] = 15
-        if not isinstance(proxy.get('retry_failed'), bool):
-            proxy['retry_failed'] = False
-            
-        # Validate logging settings
+
+        if not self.config['captcha'].get('service_url'):
+            self.config['captcha']['service_url'] = "https://freecaptchabypass.com"
+
         logging_config = self.config['logging']
-        valid_log_levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
-        if logging_config.get('level') not in valid_log_levels:
+        if logging_config.get('level') not in ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'):
             logging_config['level'] = 'INFO'
         if not logging_config.get('max_file_size', '').endswith(('KB', 'MB', 'GB')):
             logging_config['max_file_size'] = '10MB'
-        if not isinstance(logging_config.get('backup_count'), int) or logging_config['backup_count'] < 1:
-            logging_config['backup_count'] = 5
-            
-        # Save validated config
-        self._save_config()
+
+        # Write back only if validation actually repaired something -
+        # a clean config costs no disk write per startup
+        if _config_digest(self.config) != pre_digest:
+            self._save_config()
     
     def _save_config(self):
         """Save validated configuration back to file"""
         try:
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2)
+            # Raw fd write + atomic replace: no buffered-writer teardown,
+            # and readers never see a half-written config
+            data = _json_dumps(self.config)
+            tmp_path = self.config_path.with_suffix('.tmp')
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, self.config_path)
             self.logger.info("Validated configuration saved")
         except Exception as e:
             self.logger.error(f"Failed to save validated configuration: {e}")
@@ -0,0 +1,31 @@
+"""
+Discord Username Monitor - Console I/O Helpers
+Animation-free prompts for scripted and non-interactive runs
+"""
+
+import os
+import sys
+
+
+def _interactive():
+    """Whether styled prompts make sense for this stdin"""
+    if os.environ.get('MONITOR_NO_ANIMATION'):
+        return False
+    try:
+        return sys.stdin.isatty()
+    except (AttributeError, ValueError):
+        return False
+
+
+def prompt(text, color=None):
+    """Styled input prompt without the typewriter animation
+
+    pystyle's default 20 ms per-character interval adds over a second
+    of pure sleep to a long prompt. Interactive runs keep the gradient
+    styling at interval=0; piped stdin or MONITOR_NO_ANIMATION drops
+    straight to plain input().
+    """
+    if not _interactive():
+        return input(text)
+    from pystyle import Colors, Write
+    return Write.Input(text, color or Colors.blue_to_cyan, interval=0)
@@ -3,11 +3,35 @@ Discord Username Monitor - Logging Utilities
 Centralized logging configuration and utilities
 """
 
+import asyncio
+import atexit
 import logging
+import queue
 import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import aiofiles  # off-loop file I/O; executor fallback otherwise
+except ImportError:
+    aiofiles = None
+
+# Second-resolution timestamp cache: high-volume logging otherwise pays
+# a gettimeofday + localtime + strftime chain on every single entry
+_ts_cache = [0, ""]
+
+
+def _now_str():
+    """Current '%Y-%m-%d %H:%M:%S' string, recomputed once per second"""
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache[0] = now
+        _ts_cache[1] = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now))
+    return _ts_cache[1]
+
 
 def setup_logging(level=logging.INFO):
     """Setup logging configuration"""
@@ -55,11 +79,19 @@ def setup_logging(level=logging.INFO):
     # Remove existing handlers to avoid duplicates
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
-    
-    # Add handlers
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(error_handler)
-    root_logger.addHandler(console_handler)
+
+    # Route records through a queue so logging calls from async tasks
+    # return after an enqueue instead of a synchronous disk write; a
+    # listener thread drains the queue into the real handlers
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(
+        log_queue, file_handler, error_handler, console_handler,
+        respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+    root_logger.addHandler(QueueHandler(log_queue))
     
     # Reduce noise from external libraries
     logging.getLogger('selenium').setLevel(logging.WARNING)
@@ -74,22 +106,56 @@ def get_logger(name):
     return logging.getLogger(name)
 
 
+class _BufferedFile:
+    """Lazily opened append handle with batched flushing
+
+    Per-event open+write+flush+close cost four syscalls per log line;
+    a persistent 32 KB-buffered handle flushed every N writes collapses
+    them. Critical entries can force an immediate flush.
+    """
+
+    FLUSH_EVERY = 64
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._fp = None
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def write(self, text, flush=False):
+        with self._lock:
+            if self._fp is None:
+                self._fp = open(self.path, "a", encoding="utf-8", buffering=32768)
+                atexit.register(self.close)
+            self._fp.write(text)
+            self._writes += 1
+            if flush or self._writes % self.FLUSH_EVERY == 0:
+                self._fp.flush()
+
+    def close(self):
+        with self._lock:
+            if self._fp is not None:
+                try:
+                    self._fp.close()
+                except OSError:
+                    pass
+                self._fp = None
+
+
 class FileLogger:
     """Simple file logger for specific data"""
-    
+
     def __init__(self, filename):
         self.filename = Path("logs") / filename
         self.filename.parent.mkdir(exist_ok=True)
-    
+        self._file = _BufferedFile(self.filename)
+
     def log(self, message):
         """Log a message with timestamp"""
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        log_entry = f"[{timestamp}] {message}\n"
-        
+        log_entry = f"[{_now_str()}] {message}\n"
+
         try:
-            with open(self.filename, "a", encoding="utf-8") as f:
-                f.write(log_entry)
-                f.flush()
+            self._file.write(log_entry)
         except Exception as e:
             logging.error(f"Failed to write to {self.filename}: {e}")
 
@@ -103,43 +169,68 @@ class ResultLogger:
         
         self.available_file = self.results_dir / "available_usernames.txt"
         self.session_file = self.results_dir / f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+
+        self._available = _BufferedFile(self.available_file)
+        self._session = _BufferedFile(self.session_file)
     
     def log_available_username(self, username, account):
         """Log an available username immediately"""
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
+        timestamp = _now_str()
+
         # Format: username:email:password:token
         entry = f"{username}:{account.email}:{account.password or 'N/A'}:{account.token}\n"
         
         try:
-            # Log to main available file
-            with open(self.available_file, "a", encoding="utf-8") as f:
-                f.write(entry)
-                f.flush()
-            
-            # Log to session file with timestamp
-            session_entry = f"[{timestamp}] AVAILABLE: {entry}"
-            with open(self.session_file, "a", encoding="utf-8") as f:
-                f.write(session_entry)
-                f.flush()
-                
+            # Available hits are rare and valuable - force the flush so
+            # they survive a crash
+            self._available.write(entry, flush=True)
+            self._session.write(f"[{timestamp}] AVAILABLE: {entry}", flush=True)
+
+
             logging.info(f"AVAILABLE: {username} - {account.email}")
             
         except Exception as e:
             logging.error(f"Failed to log available username: {e}")
     
+    async def alog_available_username(self, username, account):
+        """Async variant of log_available_username
+
+        The sync version blocks the event loop for the write syscalls;
+        this one goes through aiofiles, or a thread-pool executor when
+        aiofiles is not installed.
+        """
+        if aiofiles is None:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self.log_available_username, username, account
+            )
+            return
+
+        timestamp = _now_str()
+        entry = f"{username}:{account.email}:{account.password or 'N/A'}:{account.token}\n"
+
+        try:
+            async with aiofiles.open(self.available_file, 'a', encoding='utf-8') as f:
+                await f.write(entry)
+
+            async with aiofiles.open(self.session_file, 'a', encoding='utf-8') as f:
+                await f.write(f"[{timestamp}] AVAILABLE: {entry}")
+
+            logging.info(f"AVAILABLE: {username} - {account.email}")
+
+        except Exception as e:
+            logging.error(f"Failed to log available username: {e}")
+
     def log_claim_attempt(self, username, account, success):
         """Log a claim attempt"""
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        timestamp = _now_str()
         status = "SUCCESS" if success else "FAILED"
         
         entry = f"[{timestamp}] CLAIM_{status}: {username} - {account.email}\n"
         
         try:
-            with open(self.session_file, "a", encoding="utf-8") as f:
-                f.write(entry)
-                f.flush()
-                
+            self._session.write(entry, flush=True)
+
+
             logging.info(f"CLAIM_{status}: {username} - {account.email}")
             
         except Exception as e:
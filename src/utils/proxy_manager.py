@@ -3,15 +3,26 @@ Discord Username Monitor - Proxy Management
 Handles proxy rotation and validation for enhanced anonymity
 """
 
+import asyncio
+import itertools
 import random
+import re
+import aiohttp
 import requests
 import time
 import threading
 from pathlib import Path
 from urllib.parse import urlparse
-from pystyle import Colors, Write
+from utils.io import prompt
 from utils.logger import get_logger
 
+# One C-level sweep recognizes all three supported formats: full URL,
+# ip:port, and ip:port:user:pass
+_PROXY_RE = re.compile(
+    r'^(?:(https?://\S+)|([\w.-]+):(\d+)(?::([^:\s]+):([^:\s]+))?)$',
+    re.M
+)
+
 
 class ProxyManager:
     """Manages proxy rotation and validation"""
@@ -24,7 +35,18 @@ class ProxyManager:
         self.working_proxies = []
         self.failed_proxies = set()
         self.current_index = 0
+        self._rot = itertools.count()  # GIL-atomic rotation counter
+        self.worker_proxies = {}
+        self._sems = {}
         self.lock = threading.Lock()
+
+        # Tombstone state over working_proxies: the list itself is
+        # frozen after configure(), dead proxies are just flagged off
+        self._alive = bytearray()
+        self._alive_count = 0
+        self._index_of = {}
+        # proxy -> (consecutive failures, monotonic time to try it again)
+        self._fail_meta = {}
         
         # Configuration
         self.enabled = False
@@ -34,12 +56,10 @@ class ProxyManager:
     
     async def configure(self):
         """Configure proxy settings interactively"""
+        from pystyle import Colors
         print(f"\n{Colors.cyan}━━━ Proxy Configuration ━━━{Colors.white}")
         
-        use_proxies = Write.Input(
-            'Use proxies for enhanced anonymity? (y/n): ',
-            Colors.blue_to_cyan, interval=0.02
-        ).lower()
+        use_proxies = prompt('Use proxies for enhanced anonymity? (y/n): ').lower()
         
         if use_proxies != 'y':
             print("Direct connection mode enabled")
@@ -55,16 +75,15 @@ class ProxyManager:
             return
         
         # Test proxies
-        test_proxies = Write.Input(
-            f'Test proxies before use? (recommended) (y/n): ',
-            Colors.blue_to_cyan, interval=0.02
-        ).lower() == 'y'
+        test_proxies = prompt('Test proxies before use? (recommended) (y/n): ').lower() == 'y'
         
         if test_proxies:
             await self._test_proxies()
         else:
             self.working_proxies = self.proxies.copy()
-        
+
+        self._seal_working_proxies()
+
         if self.working_proxies:
             self.enabled = True
             print(f"{Colors.green}✓ Proxy rotation enabled: {len(self.working_proxies)} proxies{Colors.white}")
@@ -74,6 +93,7 @@ class ProxyManager:
     
     async def _load_proxies(self):
         """Load proxies from file"""
+        from pystyle import Colors
         proxy_file = None
         
         # Check for default proxy file
@@ -96,22 +116,29 @@ class ProxyManager:
         
         try:
             with open(proxy_file, 'r', encoding='utf-8') as f:
-                lines = f.read().splitlines()
-            
-            for line_num, line in enumerate(lines, 1):
-                line = line.strip()
-                
-                # Skip empty lines and comments
-                if not line or line.startswith('#'):
-                    continue
-                
-                try:
-                    proxy = self._parse_proxy_line(line)
-                    if proxy:
-                        self.proxies.append(proxy)
-                except Exception as e:
-                    self.logger.warning(f"Invalid proxy on line {line_num}: {e}")
-            
+                text = f.read()
+
+            # Drop empties/comments, then let one compiled regex sweep
+            # the remainder instead of splitting each line in Python
+            candidates = [
+                line.strip() for line in text.splitlines()
+                if line.strip() and not line.lstrip().startswith('#')
+            ]
+
+            for match in _PROXY_RE.finditer('\n'.join(candidates)):
+                if match.group(1):
+                    self.proxies.append(match.group(1))
+                elif match.group(4):
+                    self.proxies.append(
+                        f"http://{match.group(4)}:{match.group(5)}@{match.group(2)}:{match.group(3)}"
+                    )
+                else:
+                    self.proxies.append(f"http://{match.group(2)}:{match.group(3)}")
+
+            skipped = len(candidates) - len(self.proxies)
+            if skipped:
+                self.logger.warning(f"Skipped {skipped} malformed proxy lines")
+
             print(f"Loaded {len(self.proxies)} proxies from file")
             
         except Exception as e:
@@ -141,89 +168,237 @@ class ProxyManager:
             raise ValueError(f"Invalid proxy format: {line}")
     
     async def _test_proxies(self):
-        """Test proxies for connectivity"""
+        """Test proxies for connectivity concurrently
+
+        The old serial loop paid one RTT plus a 0.2s sleep per proxy;
+        a capped aiohttp fan-out overlaps all the network waits, so a
+        few hundred proxies finish in a couple of rounds.
+        """
+        from pystyle import Colors
         print(f"\n{Colors.cyan}Testing {len(self.proxies)} proxies...{Colors.white}")
-        
+
+        sem = asyncio.Semaphore(50)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        }
+
+        async def _check(proxy):
+            async with sem:
+                try:
+                    async with session.get(
+                        "https://discord.com/api/v9/experiments",
+                        proxy=proxy,
+                        timeout=timeout,
+                        headers=headers
+                    ) as response:
+                        return proxy, response.status == 200, f"HTTP {response.status}"
+                except Exception as e:
+                    return proxy, False, str(e)
+
+        # Stop early once enough proxies work: on oversized lists the
+        # wall clock should scale with the count we need, not list size
+        enough = self.config.get('proxy', {}).get('min_working', 200)
+
         working_count = 0
         failed_count = 0
-        
-        for i, proxy in enumerate(self.proxies, 1):
-            try:
-                # Test with Discord's API
-                response = requests.get(
-                    "https://discord.com/api/v9/experiments",
-                    proxies={"http": proxy, "https": proxy},
-                    timeout=self.timeout,
-                    headers={
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                    }
-                )
-                
-                if response.status_code == 200:
+
+        connector = aiohttp.TCPConnector(limit=100, ssl=False)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            tasks = [asyncio.ensure_future(_check(proxy)) for proxy in self.proxies]
+            for fut in asyncio.as_completed(tasks):
+                proxy, ok, detail = await fut
+                if ok:
                     self.working_proxies.append(proxy)
                     working_count += 1
-                    print(f"{Colors.green}✓ Proxy {i}/{len(self.proxies)} working{Colors.white}")
+                    if working_count >= enough:
+                        break
                 else:
                     failed_count += 1
-                    print(f"{Colors.red}✗ Proxy {i}/{len(self.proxies)} failed (HTTP {response.status_code}){Colors.white}")
-                    
-            except Exception as e:
-                failed_count += 1
-                print(f"{Colors.red}✗ Proxy {i}/{len(self.proxies)} failed: {e}{Colors.white}")
-                
-            # Small delay between tests
-            time.sleep(0.2)
-        
+                    self.logger.debug(f"Proxy failed: {proxy} ({detail})")
+
+            pending = [task for task in tasks if not task.done()]
+            if pending:
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                print(f"  Reached {enough} working proxies - skipped {len(pending)} untested")
+
         print(f"\nProxy testing complete:")
         print(f"  {Colors.green}Working: {working_count}{Colors.white}")
         print(f"  {Colors.red}Failed: {failed_count}{Colors.white}")
     
+    def _seal_working_proxies(self):
+        """Freeze the working list and reset the tombstone flags"""
+        self._index_of = {proxy: i for i, proxy in enumerate(self.working_proxies)}
+        self._alive = bytearray(b'\x01' * len(self.working_proxies))
+        self._alive_count = len(self.working_proxies)
+
+    def _revive_due(self):
+        """Resurrect tombstoned proxies whose backoff expired (caller holds lock)"""
+        now = time.monotonic()
+        for proxy, (_, next_retry_at) in self._fail_meta.items():
+            if next_retry_at <= now:
+                i = self._index_of.get(proxy)
+                if i is not None and not self._alive[i]:
+                    self._alive[i] = 1
+                    self._alive_count += 1
+
+    def _next_alive_index(self):
+        """Advance current_index to the next live slot (caller holds lock)"""
+        n = len(self.working_proxies)
+        for _ in range(n):
+            i = self.current_index
+            self.current_index = (i + 1) % n
+            if self._alive[i]:
+                return i
+        return None
+
     def get_proxy(self):
         """Get next proxy for use"""
+        if not self.enabled:
+            return None
+
+        if self._alive_count == 0:
+            # Everything is backing off - see if any cooldown has expired
+            with self.lock:
+                self._revive_due()
+            if self._alive_count == 0:
+                return None
+
+        # Snapshot: the list is frozen after configure(), so no lock is
+        # needed to read it
+        wp = self.working_proxies
+
+        if not self.rotation_enabled:
+            # Always use the first live proxy
+            for i, proxy in enumerate(wp):
+                if self._alive[i]:
+                    return proxy
+            return None
+
+        # Lock-free fast path: counter.__next__ is atomic under the GIL,
+        # so concurrent workers rotate without contending on the lock
+        i = next(self._rot) % len(wp)
+        if self._alive[i]:
+            return wp[i]
+
+        # Slot was tombstoned - fall back to the locked skip-scan
+        with self.lock:
+            self._revive_due()
+            i = self._next_alive_index()
+            return wp[i] if i is not None else None
+    
+    def assign_worker(self, worker_id):
+        """Get the sticky proxy bound to a worker
+
+        Keeping a worker on one proxy preserves its CONNECT tunnel and
+        upstream TLS session; rotating per request would tear both down
+        every time.
+        """
         if not self.enabled or not self.working_proxies:
             return None
-        
+
         with self.lock:
-            if not self.rotation_enabled:
-                # Always use first proxy
-                return self.working_proxies[0]
-            
-            # Rotate through working proxies
-            proxy = self.working_proxies[self.current_index]
-            self.current_index = (self.current_index + 1) % len(self.working_proxies)
-            
+            if worker_id not in self.worker_proxies:
+                n = len(self.working_proxies)
+                index = len(self.worker_proxies) % n
+                for _ in range(n):
+                    if self._alive[index]:
+                        break
+                    index = (index + 1) % n
+                self.worker_proxies[worker_id] = self.working_proxies[index]
+            return self.worker_proxies[worker_id]
+
+    def rotate_worker(self, worker_id):
+        """Move a worker to the next proxy after a 429 or connection error"""
+        if not self.enabled or not self.working_proxies:
+            return None
+
+        with self.lock:
+            i = self._next_alive_index()
+            if i is None:
+                return None
+            proxy = self.working_proxies[i]
+            self.worker_proxies[worker_id] = proxy
             return proxy
-    
+
+    def sem_for(self, proxy):
+        """Per-proxy concurrency cap: at most 4 requests in flight per proxy
+
+        Stops the whole pool piling onto one proxy and driving it into
+        rate-limit storms when few proxies are loaded.
+        """
+        sem = self._sems.get(proxy)
+        if sem is None:
+            sem = self._sems.setdefault(proxy, asyncio.Semaphore(4))
+        return sem
+
     def get_random_proxy(self):
         """Get random proxy"""
-        if not self.enabled or not self.working_proxies:
+        if not self.enabled or self._alive_count == 0:
             return None
-        
-        return random.choice(self.working_proxies)
+
+        if self._alive_count == len(self.working_proxies):
+            return random.choice(self.working_proxies)
+
+        alive = [p for i, p in enumerate(self.working_proxies) if self._alive[i]]
+        return random.choice(alive) if alive else None
     
     def mark_proxy_failed(self, proxy):
-        """Mark a proxy as failed"""
-        if not self.retry_failed:
-            with self.lock:
-                if proxy in self.working_proxies:
-                    self.working_proxies.remove(proxy)
-                    self.failed_proxies.add(proxy)
-                    self.logger.warning(f"Proxy marked as failed: {proxy}")
+        """Back a failing proxy off exponentially instead of dropping it
+
+        Transient failures (timeouts, upstream hiccups) used to cost the
+        proxy permanently. Now each consecutive failure doubles its
+        cooldown (capped at 5 minutes) and get_proxy revives it once the
+        window expires; mark_proxy_ok clears the slate after a success.
+        """
+        if self.retry_failed:
+            return
+
+        i = self._index_of.get(proxy)
+        if i is None:
+            return
+
+        with self.lock:
+            failures, _ = self._fail_meta.get(proxy, (0, 0.0))
+            failures += 1
+            cooldown = min(300, 2 ** failures)
+            self._fail_meta[proxy] = (failures, time.monotonic() + cooldown)
+            if self._alive[i]:
+                self._alive[i] = 0
+                self._alive_count -= 1
+            self.failed_proxies.add(proxy)
+            self.logger.warning(
+                f"Proxy backing off {cooldown}s after {failures} failure(s): {proxy}"
+            )
+
+    def mark_proxy_ok(self, proxy):
+        """Clear a proxy's backoff state after a successful request"""
+        if proxy not in self._fail_meta:
+            return
+        with self.lock:
+            self._fail_meta.pop(proxy, None)
+            self.failed_proxies.discard(proxy)
+            i = self._index_of.get(proxy)
+            if i is not None and not self._alive[i]:
+                self._alive[i] = 1
+                self._alive_count += 1
     
     def has_proxies(self):
         """Check if proxies are available"""
-        return self.enabled and len(self.working_proxies) > 0
+        return self.enabled and self._alive_count > 0
     
     def proxy_count(self):
-        """Get count of working proxies"""
-        return len(self.working_proxies) if self.enabled else 0
+        """Get count of live proxies"""
+        return self._alive_count if self.enabled else 0
     
     def get_proxy_stats(self):
         """Get proxy statistics"""
         return {
             'enabled': self.enabled,
             'total_loaded': len(self.proxies),
-            'working': len(self.working_proxies),
+            'working': self._alive_count,
             'failed': len(self.failed_proxies),
             'current_index': self.current_index
         }
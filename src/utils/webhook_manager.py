@@ -3,12 +3,81 @@ Discord Username Monitor - Webhook Management
 Handles Discord webhook notifications with smart routing
 """
 
-import requests
 import asyncio
+import gzip
+import json
+import time
+import aiohttp
+from collections import OrderedDict, defaultdict
 from datetime import datetime
-from pystyle import Colors, Write
+
+try:
+    import orjson  # C-level JSON encoder; stdlib json is the fallback
+except ImportError:
+    orjson = None
+
+from utils.io import prompt
 from utils.logger import get_logger
 
+def _json_bytes(payload):
+    """Serialize a webhook payload to JSON bytes once, orjson-first"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
+
+# Second-resolution embed timestamp cache - every payload stamps "now",
+# and one isoformat per second is plenty for webhook display
+_iso_cache = [0, ""]
+
+
+def _now_iso():
+    now = int(time.time())
+    if now != _iso_cache[0]:
+        _iso_cache[0] = now
+        _iso_cache[1] = datetime.now().isoformat()
+    return _iso_cache[1]
+
+
+# Invariant embed fragments, built once instead of per notification
+_FOOTER = {"text": "Discord Username Monitor v2.0"}
+_RARE_THUMBNAIL = {"url": "https://cdn.discordapp.com/emojis/1128604593043546122.webp"}
+
+# Available-username title/color/rarity per length, indexed min(len, 6)
+_LENGTH_TEMPLATES = tuple(
+    (f"\U0001f525 ULTRA RARE USERNAME AVAILABLE ({n} chars)", 0xff6600, "Ultra Rare") if n <= 3
+    else ("\u2b50 RARE USERNAME AVAILABLE (4 chars)", 0xff9900, "Rare") if n == 4
+    else ("\u2728 Username Available", 0x4488ff, "Uncommon") if n == 5
+    else ("\u2728 Username Available", 0x4488ff, "Common")
+    for n in range(7)
+)
+
+# Mention templates per rare length - only the username interpolates.
+# Username characters are already restricted to [A-Za-z0-9._] upstream,
+# so no mention injection is possible here.
+_MENTION_FMT = {
+    1: "@everyone **ULTRA RARE ALERT (1 chars):** `{}`",
+    2: "@everyone **ULTRA RARE ALERT (2 chars):** `{}`",
+    3: "@everyone **ULTRA RARE ALERT (3 chars):** `{}`",
+    4: "@here **RARE USERNAME (4 chars):** `{}`",
+}
+
+# Static login/settings button row attached to available-username payloads
+_ACTION_ROW = [{
+    "type": 1,
+    "components": [{
+        "type": 2,
+        "style": 5,
+        "label": "Login to Discord",
+        "url": "https://discord.com/login"
+    }, {
+        "type": 2,
+        "style": 5,
+        "label": "Username Settings",
+        "url": "https://discord.com/channels/@me/settings/profile"
+    }]
+}]
+
 
 class WebhookManager:
     """Manages Discord webhook notifications"""
@@ -17,26 +86,49 @@ class WebhookManager:
         self.config = config
         self.logger = get_logger(__name__)
         self.webhooks = {}
+
+        # Lazily created aiohttp session shared by every webhook post -
+        # Discord webhooks all live on discord.com, so keep-alive
+        # connections skip the per-request TLS handshake and the event
+        # loop never blocks on a send
+        self._aio_session = None
+
+        # Coalescing buffer: standard finds accumulate per webhook and
+        # flush as one post of up to 10 embeds (Discord's payload cap)
+        self._pending = defaultdict(list)
+        self._flusher = None
+
+        # Length -> webhook URL routing cache, built once after configure
+        self._route = {}
+
+        # Short-TTL dedup LRU: (username, claim_success) -> expiry time.
+        # Discord status flapping re-reports the same username across
+        # consecutive cycles; repeat posts within 60 s are dropped
+        self._recent = OrderedDict()
+
+        # Request-body gzip is undocumented on Discord's side; flipped
+        # off for the whole run the first time a compressed post fails
+        self._gzip_ok = True
+
+        # Per-webhook token bucket: url -> (tokens, last refill time).
+        # Discord allows 5 posts per 2 s per webhook; pacing here avoids
+        # burning a request and a payload build just to get a 429 back
+        self._buckets = {}
         
     async def configure(self):
         """Configure Discord webhooks interactively"""
+        from pystyle import Colors
         print(f"\n{Colors.cyan}━━━ Webhook Configuration ━━━{Colors.white}")
         print("Webhooks provide real-time notifications when usernames become available")
         
-        use_webhooks = Write.Input(
-            'Enable webhook notifications? (y/n): ',
-            Colors.blue_to_cyan, interval=0.02
-        ).lower()
+        use_webhooks = prompt('Enable webhook notifications? (y/n): ').lower()
         
         if use_webhooks != 'y':
             print("Webhook notifications disabled")
             return
         
         # Ask for webhook strategy
-        use_multiple = Write.Input(
-            'Use separate webhooks for different username types? (y/n): ',
-            Colors.blue_to_cyan, interval=0.02
-        ).lower() == 'y'
+        use_multiple = prompt('Use separate webhooks for different username types? (y/n): ').lower() == 'y'
         
         if use_multiple:
             await self._configure_multiple_webhooks()
@@ -45,16 +137,16 @@ class WebhookManager:
         
         # Send test notifications
         if self.webhooks:
+            self._build_route_cache()
             await self._send_test_notifications()
+            self._flusher = asyncio.create_task(self._flush_loop())
     
     async def _configure_single_webhook(self):
         """Configure single webhook for all notifications"""
+        from pystyle import Colors
         print(f"\n{Colors.cyan}Configuring single webhook:{Colors.white}")
         
-        url = Write.Input(
-            'Discord webhook URL: ',
-            Colors.blue_to_cyan, interval=0.02
-        ).strip()
+        url = prompt('Discord webhook URL: ').strip()
         
         if url and await self._test_webhook(url):
             self.webhooks['all'] = url
@@ -66,6 +158,7 @@ class WebhookManager:
     
     async def _configure_multiple_webhooks(self):
         """Configure multiple webhooks for different categories"""
+        from pystyle import Colors
         print(f"\n{Colors.cyan}Configuring targeted webhooks:{Colors.white}")
         
         categories = {
@@ -74,16 +167,25 @@ class WebhookManager:
             'standard': 'All other usernames (5+ characters)'
         }
         
+        # Collect the URLs first, then test them all in one round trip
+        candidates = []
         for category, description in categories.items():
-            url = Write.Input(
-                f'[{category.upper()}] {description} - Webhook URL (or skip): ',
-                Colors.blue_to_cyan, interval=0.02
-            ).strip()
-            
-            if url and await self._test_webhook(url):
+            url = prompt(f'[{category.upper()}] {description} - Webhook URL (or skip): ').strip()
+            if url:
+                candidates.append((category, url))
+
+        if not candidates:
+            return
+
+        results = await asyncio.gather(
+            *[self._test_webhook(url) for _, url in candidates]
+        )
+
+        for (category, url), ok in zip(candidates, results):
+            if ok:
                 self.webhooks[category] = url
                 print(f"{Colors.green}✓ {category} webhook configured{Colors.white}")
-            elif url:
+            else:
                 print(f"{Colors.red}✗ {category} webhook test failed{Colors.white}")
     
     async def _test_webhook(self, url):
@@ -95,12 +197,11 @@ class WebhookManager:
                     "description": "Webhook test successful - Monitoring system ready",
                     "color": 0x00ff88,
                     "footer": {"text": "Discord Username Monitor v2.0"},
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": _now_iso()
                 }]
             }
             
-            response = requests.post(url, json=test_payload, timeout=10)
-            return response.status_code == 204
+            return await self._post(url, test_payload) == 204
             
         except Exception as e:
             self.logger.error(f"Webhook test failed: {e}")
@@ -108,15 +209,22 @@ class WebhookManager:
     
     async def _send_test_notifications(self):
         """Send test notifications to configured webhooks"""
+        from pystyle import Colors
         print(f"\n{Colors.cyan}Sending test notifications...{Colors.white}")
         
-        for webhook_name, webhook_url in self.webhooks.items():
-            try:
-                await self._send_startup_notification(webhook_url, webhook_name)
+        # Independent per URL, so fire them all at once
+        items = list(self.webhooks.items())
+        results = await asyncio.gather(
+            *[self._send_startup_notification(url, name) for name, url in items],
+            return_exceptions=True
+        )
+
+        for (webhook_name, _), result in zip(items, results):
+            if isinstance(result, Exception):
+                print(f"{Colors.red}✗ Failed to send test to {webhook_name}: {result}{Colors.white}")
+                self.logger.error(f"Test notification failed for {webhook_name}: {result}")
+            else:
                 print(f"{Colors.green}✓ Test sent to {webhook_name} webhook{Colors.white}")
-            except Exception as e:
-                print(f"{Colors.red}✗ Failed to send test to {webhook_name}: {e}{Colors.white}")
-                self.logger.error(f"Test notification failed for {webhook_name}: {e}")
     
     async def _send_startup_notification(self, webhook_url, webhook_name):
         """Send startup notification"""
@@ -137,90 +245,171 @@ class WebhookManager:
                 }
             ],
             "footer": {"text": "Discord Username Monitor v2.0"},
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso()
         }
         
         payload = {"embeds": [embed]}
-        requests.post(webhook_url, json=payload, timeout=10)
+        await self._post(webhook_url, payload)
     
+    def _session(self):
+        """The shared ClientSession, created on first use"""
+        if self._aio_session is None or self._aio_session.closed:
+            self._aio_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=16, keepalive_timeout=75)
+            )
+        return self._aio_session
+
+    async def _throttle(self, url):
+        """Wait until this webhook's bucket has a token (5 per 2 s)"""
+        now = time.monotonic()
+        tokens, last = self._buckets.get(url, (5.0, now))
+        tokens = min(5.0, tokens + (now - last) * 2.5)
+        if tokens < 1.0:
+            await asyncio.sleep((1.0 - tokens) * 0.4)
+            now = time.monotonic()
+            tokens = 1.0
+        self._buckets[url] = (tokens - 1.0, now)
+
+    async def _post(self, url, payload, timeout=10):
+        """POST a payload and return the HTTP status
+
+        The payload is encoded to bytes once up front instead of letting
+        aiohttp re-walk the dict through the default encoder per request.
+        Verbose embed bodies (repeated field labels compress well) are
+        tried gzipped first, but Discord only documents gzip for
+        responses - on rejection the body is resent uncompressed and
+        compression stays off for the rest of the run.
+        """
+        await self._throttle(url)
+        body = _json_bytes(payload)
+        headers = {"Content-Type": "application/json"}
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+        if self._gzip_ok and len(body) > 512:
+            async with self._session().post(
+                url,
+                data=gzip.compress(body, 1),
+                headers={**headers, "Content-Encoding": "gzip"},
+                timeout=client_timeout
+            ) as response:
+                if response.status < 400:
+                    return response.status
+            self._gzip_ok = False
+            self.logger.warning(
+                "Webhook rejected gzipped body - resending uncompressed and disabling compression"
+            )
+
+        async with self._session().post(
+            url,
+            data=body,
+            headers=headers,
+            timeout=client_timeout
+        ) as response:
+            return response.status
+
     def has_webhooks(self):
         """Check if any webhooks are configured"""
         return len(self.webhooks) > 0
     
     async def send_notification(self, username, account, claim_success=None):
         """Send notification for available username"""
+        # Drop identical notifications repeated within the TTL window
+        key = (username, claim_success)
+        now = time.monotonic()
+        expiry = self._recent.get(key)
+        if expiry is not None and expiry > now:
+            return
+        self._recent[key] = now + 60
+        self._recent.move_to_end(key)
+        if len(self._recent) > 4096:
+            self._recent.popitem(last=False)
+
         webhook_url = self._get_webhook_for_username(username)
         if not webhook_url:
             return
         
         try:
             embed = self._create_notification_embed(username, account, claim_success)
-            
-            # Create payload
-            payload = {"embeds": [embed]}
-            
-            # Add mention for rare usernames
-            if len(username) <= 3:
-                payload["content"] = f"@everyone **ULTRA RARE ALERT ({len(username)} chars):** `{username}`"
-            elif len(username) == 4:
-                payload["content"] = f"@here **RARE USERNAME (4 chars):** `{username}`"
-            
-            # Add action buttons for available usernames
-            if claim_success is None:  # Available, not claimed yet
-                payload["components"] = [{
-                    "type": 1,
-                    "components": [{
-                        "type": 2,
-                        "style": 5,
-                        "label": "Login to Discord",
-                        "url": "https://discord.com/login"
-                    }, {
-                        "type": 2,
-                        "style": 5,
-                        "label": "Username Settings",
-                        "url": "https://discord.com/channels/@me/settings/profile"
-                    }]
-                }]
-            
-            # Send notification
-            response = requests.post(webhook_url, json=payload, timeout=15)
-            
-            if response.status_code == 204:
-                self.logger.info(f"Notification sent: {username}")
-            else:
-                self.logger.error(f"Notification failed: HTTP {response.status_code}")
-                
+
+            # Rare finds and claim results keep their own payload so
+            # @everyone/@here mentions land immediately
+            if len(username) <= 4 or claim_success is not None:
+                payload = {"embeds": [embed]}
+
+                mention_fmt = _MENTION_FMT.get(len(username))
+                if mention_fmt:
+                    payload["content"] = mention_fmt.format(username)
+
+                if claim_success is None:  # Available, not claimed yet
+                    payload["components"] = _ACTION_ROW
+
+                status = await self._post(webhook_url, payload, timeout=15)
+
+                if status == 204:
+                    self.logger.info(f"Notification sent: {username}")
+                else:
+                    self.logger.error(f"Notification failed: HTTP {status}")
+                return
+
+            # Standard finds coalesce: one post per webhook per flush
+            # window instead of one per username
+            pending = self._pending[webhook_url]
+            pending.append(embed)
+            if len(pending) >= 10:
+                await self._flush_one(webhook_url)
+
         except Exception as e:
             self.logger.error(f"Notification error for {username}: {e}")
+
+    async def _flush_loop(self):
+        """Flush coalesced notifications every 500 ms"""
+        try:
+            while True:
+                await asyncio.sleep(0.5)
+                for webhook_url in list(self._pending):
+                    await self._flush_one(webhook_url)
+        except asyncio.CancelledError:
+            # Drain whatever is still buffered before shutting down
+            for webhook_url in list(self._pending):
+                await self._flush_one(webhook_url)
+            raise
+
+    async def _flush_one(self, webhook_url):
+        """Post the buffered embeds for one webhook, 10 per payload"""
+        embeds = self._pending.pop(webhook_url, [])
+        while embeds:
+            chunk, embeds = embeds[:10], embeds[10:]
+            payload = {"embeds": chunk, "components": _ACTION_ROW}
+            try:
+                status = await self._post(webhook_url, payload, timeout=15)
+                if status == 204:
+                    self.logger.info(f"Sent {len(chunk)} coalesced notifications")
+                else:
+                    self.logger.error(f"Coalesced notification failed: HTTP {status}")
+            except Exception as e:
+                self.logger.error(f"Coalesced notification error: {e}")
     
     def _create_notification_embed(self, username, account, claim_success):
         """Create Discord embed for notification"""
         username_len = len(username)
-        
+        tpl_title, tpl_color, rarity = _LENGTH_TEMPLATES[min(username_len, 6)]
+
         # Determine embed properties based on status
         if claim_success is True:
-            title = f"🎉 CLAIMED: {username}"
+            title = f"\U0001f389 CLAIMED: {username}"
             color = 0x00ff88
             description = f"Successfully claimed **{username}**!"
         elif claim_success is False:
-            title = f"❌ CLAIM FAILED: {username}"
+            title = f"\u274c CLAIM FAILED: {username}"
             color = 0xff4444
             description = f"Failed to claim **{username}** - manual action needed"
         else:
-            # Available username
-            if username_len <= 3:
-                title = f"🔥 ULTRA RARE USERNAME AVAILABLE ({username_len} chars)"
-                color = 0xff6600
-            elif username_len == 4:
-                title = f"⭐ RARE USERNAME AVAILABLE (4 chars)"
-                color = 0xff9900
-            else:
-                title = f"✨ Username Available"
-                color = 0x4488ff
-            
+            # Available username - title/color come from the template
+            title = tpl_title
+            color = tpl_color
             description = f"**`{username}`** is ready for claiming!"
-        
-        # Create embed
+
+        # Create embed around the precomputed fragments
         embed = {
             "title": title,
             "description": description,
@@ -228,34 +417,30 @@ class WebhookManager:
             "fields": [
                 {
                     "name": "Account Credentials",
-                    "value": f"```\nEmail: {account.email}\nPassword: {account.password or 'N/A'}\nToken: {account.token[:20]}...\n```",
+                    "value": account.credentials_field,
                     "inline": False
                 },
                 {
                     "name": "Username Details",
-                    "value": f"Length: {username_len} characters\nRarity: {self._get_rarity_text(username_len)}",
+                    "value": f"Length: {username_len} characters\nRarity: {rarity}",
                     "inline": True
                 }
             ],
-            "footer": {"text": "Discord Username Monitor v2.0"},
-            "timestamp": datetime.now().isoformat()
+            "footer": _FOOTER,
+            "timestamp": _now_iso()
         }
         
         # Add thumbnail for rare usernames
         if username_len <= 4:
-            embed["thumbnail"] = {
-                "url": "https://cdn.discordapp.com/emojis/1128604593043546122.webp"
-            }
+            embed["thumbnail"] = _RARE_THUMBNAIL
         
         return embed
     
-    def _get_webhook_for_username(self, username):
-        """Get appropriate webhook URL for username"""
+    def _resolve_route(self, username_len):
+        """Webhook URL for a username length (uncached ladder)"""
         if 'all' in self.webhooks:
             return self.webhooks['all']
         
-        username_len = len(username)
-        
         if username_len <= 3 and 'rare' in self.webhooks:
             return self.webhooks['rare']
         elif username_len == 4 and '4char' in self.webhooks:
@@ -265,17 +450,16 @@ class WebhookManager:
         
         # Fallback to first available webhook
         return next(iter(self.webhooks.values())) if self.webhooks else None
-    
-    def _get_rarity_text(self, length):
-        """Get rarity description for username length"""
-        if length <= 3:
-            return "Ultra Rare"
-        elif length == 4:
-            return "Rare"
-        elif length == 5:
-            return "Uncommon"
-        else:
-            return "Common"
+
+    def _build_route_cache(self):
+        """Memoize routing per length - webhooks are fixed after configure"""
+        self._route = {n: self._resolve_route(n) for n in range(1, 33)}
+
+    def _get_webhook_for_username(self, username):
+        """Get appropriate webhook URL for username (one dict lookup)"""
+        if not self._route and self.webhooks:
+            self._build_route_cache()
+        return self._route.get(min(len(username), 32))
     
     async def send_periodic_stats(self, stats):
         """Send periodic statistics update"""
@@ -296,16 +480,15 @@ class WebhookManager:
                     {"name": "Runtime", "value": self._format_runtime(stats.get('runtime_seconds', 0)), "inline": True}
                 ],
                 "footer": {"text": "Discord Username Monitor v2.0"},
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
             
             payload = {"embeds": [embed]}
             
             # Send to first webhook only for stats
             webhook_url = next(iter(self.webhooks.values()))
-            response = requests.post(webhook_url, json=payload, timeout=10)
-            
-            if response.status_code == 204:
+
+            if await self._post(webhook_url, payload) == 204:
                 self.logger.info("Periodic stats sent")
             
         except Exception as e:
@@ -333,16 +516,30 @@ class WebhookManager:
                     {"name": "Total Runtime", "value": self._format_runtime(final_stats.get('runtime_seconds', 0)), "inline": True}
                 ],
                 "footer": {"text": "Discord Username Monitor v2.0"},
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso()
             }
             
             payload = {"embeds": [embed]}
             
-            # Send to all webhooks
-            for webhook_url in self.webhooks.values():
-                requests.post(webhook_url, json=payload, timeout=10)
-                
+            # Broadcast to all webhooks at once
+            await asyncio.gather(
+                *[self._post(url, payload) for url in self.webhooks.values()],
+                return_exceptions=True
+            )
+
             self.logger.info("Shutdown notifications sent")
             
         except Exception as e:
-            self.logger.error(f"Shutdown notification error: {e}")
\ No newline at end of file
+            self.logger.error(f"Shutdown notification error: {e}")
+    async def close(self):
+        """Flush pending notifications and release the connection pool"""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+        if self._aio_session is not None and not self._aio_session.closed:
+            await self._aio_session.close()